@@ -0,0 +1,80 @@
+"""
+Degree audit parsing shared by the Vercel upload handler and the Flask backend.
+
+    from _audit_parser import parse_pdf, summarize
+    parsed = parse_pdf(pdf_bytes)   # {"completed": {"CS 141", ...}, "in_progress": ..., ...}
+
+Course codes use the database format ("CS 141"), so the parsed sets can be
+compared directly against major_requirements / major_electives.
+"""
+import hashlib
+from typing import Dict, Set, List, Iterable
+
+from _course_codes import normalize_code
+
+from .text import AuditTextParser, END_MARKERS, parse_text
+from .extractors import (EXTRACTORS, register_extractor, unregister_extractor,
+                         iter_pages_pypdfium2, iter_pages_pdfplumber, iter_pages_pdfminer,
+                         iter_pages_pypdf, extract_text_any)
+from .cache import AuditResultCache, audit_digest, parse_with_cache
+
+# Bump whenever parsing output changes so cached results are not reused.
+# AUDIT_END_MARKERS changes the output too, so a configured marker set is
+# folded in (hashed, since the version becomes part of cache file names)
+PARSER_VERSION = "2"
+if END_MARKERS:
+    PARSER_VERSION += "-" + hashlib.sha256("|".join(END_MARKERS).encode("utf-8")).hexdigest()[:12]
+
+def parse_pdf_detailed(pdf_bytes: bytes, end_markers: Iterable[str] = END_MARKERS):
+    """
+    Extract and parse courses, trying EXTRACTORS in order.
+    Pages are parsed as they are extracted and extraction stops early once an
+    end marker is reached. An extractor whose text yields no courses falls
+    through to the next one. Returns (parsed, extractor_name).
+    """
+    fallback = None
+    for name, iter_pages in EXTRACTORS:
+        parser = AuditTextParser(end_markers)
+        try:
+            parser.feed_pages(iter_pages(pdf_bytes))
+        except Exception:
+            # Library missing or extraction failed: fall through to the next extractor
+            continue
+        if not parser.saw_text:
+            continue
+        parsed = parser.result()
+        if parser.completed or parser.in_progress:
+            return parsed, name
+        if fallback is None:
+            # Text but no courses: keep the first result in case no extractor does better
+            fallback = (parsed, name)
+    if fallback is not None:
+        return fallback
+    raise RuntimeError("PDF parsing library not available or failed to extract text.")
+
+def parse_pdf(pdf_bytes: bytes, end_markers: Iterable[str] = END_MARKERS):
+    """Main entry point: Extract text and parse courses."""
+    parsed, _ = parse_pdf_detailed(pdf_bytes, end_markers)
+    return parsed
+
+def summarize(parsed: Dict[str, Set[str]], major_required: Set[str], major_electives: Set[str]) -> Dict[str, List[str]]:
+    completed = parsed.get("completed", set())
+    in_progress = parsed.get("in_progress", set())
+    planned = parsed.get("planned", set())
+    needed = parsed.get("needed", set())
+
+    # Parsed codes are already canonical; requirement codes may come in any spelling
+    major_required = {normalize_code(c) for c in major_required}
+    major_electives = {normalize_code(c) for c in major_electives}
+
+    remaining_required = sorted([c for c in major_required if c not in completed and c not in in_progress])
+    remaining_electives = sorted([c for c in major_electives if c not in completed and c not in in_progress])
+
+    return {
+        "completedCourses": sorted(list(completed)),
+        "inProgressCourses": sorted(list(in_progress)),
+        "remainingRequired": remaining_required,
+        "remainingElectives": remaining_electives,
+        "plannedCourses": sorted(list(planned)),
+        "neededCoursesRaw": sorted(list(needed)),
+    }
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+# Defaults can be tuned per deployment without code changes
+DEFAULT_MAX_ENTRIES = int(os.environ.get('AUDIT_CACHE_MAX_ENTRIES', 256))
+DEFAULT_TTL_SECONDS = int(os.environ.get('AUDIT_CACHE_TTL', 24 * 60 * 60))
+DEFAULT_DIRECTORY = os.environ.get(
+    'AUDIT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'coursescope-audit-cache'))
+
+def audit_digest(file_bytes, namespace=''):
+    """Content hash of an uploaded PDF; namespace lets parser changes start a fresh cache."""
+    digest = hashlib.sha256(file_bytes).hexdigest()
+    return f"{namespace}-{digest}" if namespace else digest
+
+class AuditResultCache:
+    """
+    Bounded LRU of parsed audit results keyed by the uploaded file's content hash.
+    Only the parsed course sets are stored, never the PDF. Entries expire after
+    ttl_seconds. When a directory is given, entries are also written there as
+    small JSON files, so a warm instance or a restarted worker can reuse them.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 directory=DEFAULT_DIRECTORY):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.directory = directory
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            try:
+                os.makedirs(directory, exist_ok=True)
+            except OSError:
+                # Read-only filesystem: memory only
+                self.directory = None
+
+    def get(self, key):
+        """Return the cached parse result (dict of sets) or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, parsed = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    return _to_sets(parsed)
+                del self._entries[key]
+
+        entry = self._read_disk(key, now)
+        if entry is None:
+            return None
+        with self._lock:
+            self._remember(key, entry)
+        return _to_sets(entry[1])
+
+    def put(self, key, parsed):
+        """Store a parse result; sets are kept as sorted lists."""
+        entry = (time.time(), {name: sorted(codes) for name, codes in parsed.items()})
+        with self._lock:
+            self._remember(key, entry)
+        self._write_disk(key, entry)
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def _read_disk(self, key, now):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if now - data.get('stored_at', 0) > self.ttl_seconds:
+            self._remove(path)
+            return None
+        return data['stored_at'], data['parsed']
+
+    def _write_disk(self, key, entry):
+        if not self.directory:
+            return
+        stored_at, parsed = entry
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'stored_at': stored_at, 'parsed': parsed}, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(tmp_path)
+            return
+        self._prune_disk()
+
+    def _prune_disk(self):
+        """Keep at most max_entries files on disk, dropping expired and oldest first."""
+        try:
+            names = [n for n in os.listdir(self.directory) if n.endswith('.json')]
+        except OSError:
+            return
+        if len(names) <= self.max_entries:
+            return
+        paths = [os.path.join(self.directory, n) for n in names]
+        by_age = []
+        for path in paths:
+            try:
+                by_age.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+        by_age.sort()
+        expired_before = time.time() - self.ttl_seconds
+        excess = len(by_age) - self.max_entries
+        for mtime, path in by_age:
+            if excess <= 0 and mtime >= expired_before:
+                break
+            self._remove(path)
+            excess -= 1
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def _to_sets(parsed):
+    return {name: set(codes) for name, codes in parsed.items()}
+
+def parse_with_cache(file_bytes, parse, cache, namespace=''):
+    """
+    Parse file_bytes with parse(), reusing a cached result for identical uploads.
+    Returns (parsed, cache_hit).
+    """
+    key = audit_digest(file_bytes, namespace)
+    parsed = cache.get(key)
+    if parsed is not None:
+        return parsed, True
+    parsed = parse(file_bytes)
+    cache.put(key, parsed)
+    return parsed, False
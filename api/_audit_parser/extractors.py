@@ -0,0 +1,226 @@
+"""
+Page text extractors. Each extractor is a callable
+iter_pages(file_bytes, workers=None) yielding page texts in document order;
+parse_pdf() tries the registered extractors in EXTRACTORS order.
+"""
+import io
+import os
+import pickle
+from typing import Optional, List, Callable, Iterator, Tuple
+
+Extractor = Callable[..., Iterator[str]]
+
+def _available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+# Worker processes for per-page extraction; size to the function's CPU allotment.
+# 1 disables the process pool.
+PDF_WORKERS = int(os.environ.get("AUDIT_PDF_WORKERS", _available_cpus()))
+# Below this many pages the pool start-up costs more than it saves
+PARALLEL_MIN_PAGES = int(os.environ.get("AUDIT_PARALLEL_MIN_PAGES", 4))
+# Page ranges queued per worker; ranges beyond the first round are only
+# started if the parser still wants pages when a worker frees up
+RANGES_PER_WORKER = 4
+
+def _split_pages(page_count: int, parts: int) -> List[range]:
+    """Split page indexes into at most `parts` contiguous, ordered ranges."""
+    parts = max(1, min(parts, page_count))
+    size, extra = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append(range(start, stop))
+        start = stop
+    return ranges
+
+def _extract_pages_parallel(file_bytes: bytes, page_count: int,
+                            extract_range: Callable[[bytes, range], List[str]],
+                            workers: int) -> Optional[Iterator[str]]:
+    """
+    Run extract_range over page ranges in a process pool; each worker opens the
+    PDF bytes independently. Returns an iterator of page texts in document
+    order, or None when a pool cannot be started here (e.g. no shared memory
+    on serverless hosts), so the caller extracts serially instead.
+    """
+    try:
+        from concurrent.futures import ProcessPoolExecutor
+    except ImportError:
+        return None
+    ranges = _split_pages(page_count, workers * RANGES_PER_WORKER)
+    try:
+        pool = ProcessPoolExecutor(max_workers=min(workers, len(ranges)))
+    except (NotImplementedError, OSError):
+        return None
+    return _pool_pages(pool, file_bytes, ranges, extract_range)
+
+def _pool_pages(pool, file_bytes: bytes, ranges: List[range],
+                extract_range: Callable[[bytes, range], List[str]]) -> Iterator[str]:
+    """
+    Yield each range's pages as soon as it and every range before it are done,
+    so the parser can start on the first pages while later ones are extracted.
+    A range whose worker could not start, died or could not exchange its
+    arguments is extracted in this process. Closing the iterator (an end
+    marker was reached) cancels the ranges no worker has started yet.
+    """
+    from concurrent.futures.process import BrokenProcessPool
+    pool_errors = (OSError, BrokenProcessPool, pickle.PicklingError)
+    try:
+        try:
+            futures = [pool.submit(extract_range, file_bytes, pages) for pages in ranges]
+        except pool_errors:
+            futures = [None] * len(ranges)
+        for pages, future in zip(ranges, futures):
+            chunk = None
+            if future is not None:
+                try:
+                    chunk = future.result()
+                except pool_errors:
+                    pass
+            if chunk is None:
+                chunk = extract_range(file_bytes, pages)
+            yield from chunk
+    finally:
+        # Ranges already running finish; queued ones are dropped
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def _parallel_pages(file_bytes: bytes, page_count: int,
+                    extract_range: Callable[[bytes, range], List[str]],
+                    workers: Optional[int]) -> Optional[Iterator[str]]:
+    """Page texts from the process pool, or None when sequential extraction applies."""
+    workers = PDF_WORKERS if workers is None else workers
+    if workers > 1 and page_count >= PARALLEL_MIN_PAGES:
+        return _extract_pages_parallel(file_bytes, page_count, extract_range, workers)
+    return None
+
+def _pdfplumber_page_range(file_bytes: bytes, pages: range) -> List[str]:
+    """Extract text for a range of 0-based page indexes with pdfplumber."""
+    import pdfplumber  # type: ignore
+    texts = []
+    # pdfplumber takes 1-based page numbers
+    with pdfplumber.open(io.BytesIO(file_bytes), pages=[i + 1 for i in pages]) as pdf:
+        for page in pdf.pages:
+            try:
+                texts.append(page.extract_text() or "")
+            except Exception:
+                texts.append("")
+    return texts
+
+def _pdfminer_page_range(file_bytes: bytes, pages: range) -> List[str]:
+    """Extract text for a range of 0-based page indexes with pdfminer (one chunk per range)."""
+    from pdfminer.high_level import extract_text  # type: ignore
+    from pdfminer.layout import LAParams  # type: ignore
+    return [extract_text(io.BytesIO(file_bytes), page_numbers=list(pages), laparams=LAParams())]
+
+def _count_pages(file_bytes: bytes) -> int:
+    from pdfminer.pdfpage import PDFPage  # type: ignore
+    return sum(1 for _ in PDFPage.get_pages(io.BytesIO(file_bytes)))
+
+def iter_pages_pypdfium2(file_bytes: bytes, workers: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield page texts with pypdfium2 (PDFium's text layer, no layout analysis).
+    Much faster than pdfplumber/pdfminer; workers is accepted for a uniform
+    signature but unused since PDFium extraction is already cheap.
+    """
+    import pypdfium2 as pdfium  # type: ignore
+    pdf = pdfium.PdfDocument(file_bytes)
+    try:
+        for index in range(len(pdf)):
+            page = pdf[index]
+            try:
+                textpage = page.get_textpage()
+                try:
+                    yield textpage.get_text_range()
+                finally:
+                    textpage.close()
+            finally:
+                page.close()
+    finally:
+        pdf.close()
+
+def iter_pages_pdfplumber(file_bytes: bytes, workers: Optional[int] = None) -> Iterator[str]:
+    """Yield page texts with pdfplumber, one page at a time unless the process pool applies."""
+    import pdfplumber  # type: ignore
+    pages = _parallel_pages(file_bytes, _count_pages(file_bytes), _pdfplumber_page_range, workers)
+    if pages is not None:
+        yield from pages
+        return
+    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+        for page in pdf.pages:
+            try:
+                yield page.extract_text() or ""
+            except Exception:
+                yield ""
+
+def iter_pages_pdfminer(file_bytes: bytes, workers: Optional[int] = None) -> Iterator[str]:
+    """Yield page texts with pdfminer, one page at a time unless the process pool applies."""
+    from pdfminer.converter import TextConverter  # type: ignore
+    from pdfminer.layout import LAParams  # type: ignore
+    from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter  # type: ignore
+    from pdfminer.pdfpage import PDFPage  # type: ignore
+    pages = _parallel_pages(file_bytes, _count_pages(file_bytes), _pdfminer_page_range, workers)
+    if pages is not None:
+        yield from pages
+        return
+    resource_manager = PDFResourceManager()
+    output_string = io.StringIO()
+    device = TextConverter(resource_manager, output_string, laparams=LAParams())
+    interpreter = PDFPageInterpreter(resource_manager, device)
+    try:
+        for page in PDFPage.get_pages(io.BytesIO(file_bytes)):
+            interpreter.process_page(page)
+            yield output_string.getvalue()
+            output_string.seek(0)
+            output_string.truncate(0)
+    finally:
+        device.close()
+
+def iter_pages_pypdf(file_bytes: bytes, workers: Optional[int] = None) -> Iterator[str]:
+    """Yield page texts with pypdf, or PyPDF2 on older installs."""
+    try:
+        from pypdf import PdfReader  # type: ignore
+    except ImportError:
+        from PyPDF2 import PdfReader  # type: ignore
+    reader = PdfReader(io.BytesIO(file_bytes))
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+# Extractors in order of preference: the fast text path first, layout-aware fallbacks after
+EXTRACTORS: List[Tuple[str, Extractor]] = [
+    ("pypdfium2", iter_pages_pypdfium2),
+    ("pdfplumber", iter_pages_pdfplumber),
+    ("pdfminer", iter_pages_pdfminer),
+    ("pypdf", iter_pages_pypdf),
+]
+
+def register_extractor(name: str, iter_pages: Extractor, before: Optional[str] = None) -> None:
+    """
+    Add (or replace) an extractor plugin. It is appended to the chain, or
+    inserted ahead of the extractor named by before.
+    """
+    unregister_extractor(name)
+    names = [existing for existing, _ in EXTRACTORS]
+    index = names.index(before) if before in names else len(EXTRACTORS)
+    EXTRACTORS.insert(index, (name, iter_pages))
+
+def unregister_extractor(name: str) -> None:
+    """Drop an extractor from the chain (e.g. a library known to misread a layout)."""
+    EXTRACTORS[:] = [(existing, fn) for existing, fn in EXTRACTORS if existing != name]
+
+def extract_text_any(file_bytes: bytes) -> str:
+    """
+    Whole-document text from the first extractor in EXTRACTORS that returns any.
+    Raises RuntimeError when none is installed or every one fails.
+    """
+    for _name, iter_pages in EXTRACTORS:
+        try:
+            text = "\n".join(iter_pages(file_bytes))
+        except Exception:
+            # Library missing or extraction failed: try the next extractor
+            continue
+        if text.strip():
+            return text
+    raise RuntimeError("PDF parsing library not available or failed to extract text.")
@@ -0,0 +1,85 @@
+"""
+Golden-output corpus for the audit parser.
+
+    golden/<case>.txt   extracted audit text, pages separated by form feeds
+    golden/<case>.pdf   synthetic audit PDF (no student data)
+    golden/<case>.json  expected {"completed": [...], "in_progress": [...]}
+
+Text cases pin the line parser; PDF cases additionally run every installed
+extractor, so a fast path that reads a layout differently is caught.
+
+Run from api/:  python -m _audit_parser.golden [--update]
+Exits non-zero when any case differs from its expected output.
+"""
+import json
+import os
+import sys
+
+from . import parse_pdf_detailed
+from .extractors import EXTRACTORS
+from .text import AuditTextParser
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+
+def _as_lists(parsed):
+    return {key: sorted(parsed[key]) for key in ('completed', 'in_progress')}
+
+def _parse_pages(pages):
+    parser = AuditTextParser()
+    parser.feed_pages(iter(pages))
+    return _as_lists(parser.result())
+
+def run_case(path):
+    """Return {label: parsed} for one corpus file; labels name the parse path."""
+    if path.endswith('.txt'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return {'text': _parse_pages(f.read().split('\f'))}
+
+    with open(path, 'rb') as f:
+        pdf_bytes = f.read()
+    parsed, _ = parse_pdf_detailed(pdf_bytes)
+    results = {'parse_pdf': _as_lists(parsed)}
+    for name, iter_pages in EXTRACTORS:
+        try:
+            results[name] = _parse_pages(iter_pages(pdf_bytes))
+        except ImportError:
+            # Extractor library not installed here
+            continue
+    return results
+
+def cases():
+    for name in sorted(os.listdir(GOLDEN_DIR)):
+        if name.endswith(('.txt', '.pdf')):
+            yield os.path.join(GOLDEN_DIR, name)
+
+def main(argv):
+    update = '--update' in argv
+    failures = 0
+    for path in cases():
+        expected_path = os.path.splitext(path)[0] + '.json'
+        results = run_case(path)
+        primary = results.get('text', results.get('parse_pdf'))
+        if update:
+            with open(expected_path, 'w', encoding='utf-8') as f:
+                json.dump(primary, f, indent=2)
+                f.write('\n')
+            print(f"updated {os.path.basename(expected_path)}")
+            continue
+
+        with open(expected_path, 'r', encoding='utf-8') as f:
+            expected = json.load(f)
+        for label, parsed in results.items():
+            if parsed == expected:
+                print(f"ok    {os.path.basename(path)} [{label}]")
+                continue
+            failures += 1
+            print(f"FAIL  {os.path.basename(path)} [{label}]")
+            for key in ('completed', 'in_progress'):
+                missing = sorted(set(expected[key]) - set(parsed[key]))
+                extra = sorted(set(parsed[key]) - set(expected[key]))
+                if missing or extra:
+                    print(f"        {key}: missing {missing} unexpected {extra}")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
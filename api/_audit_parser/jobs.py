@@ -0,0 +1,248 @@
+"""
+SQLite-backed job queue for parsing audits off the request path.
+
+Uploads in async mode store the PDF and return a job id right away; a fixed
+pool of worker threads (or a standalone worker process sharing the same
+database file) parses queued jobs in order, and clients poll the job for the
+result. Under an upload spike jobs simply wait in the queue instead of
+holding request slots until they time out.
+
+Async mode is served by the Flask backend only: Vercel functions share no
+disk between handlers and freeze background threads after responding, so a
+queued job there could never be picked up.
+
+Run a standalone worker from api/:  python -m _audit_parser.jobs
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from . import parse_pdf, summarize, PARSER_VERSION
+from .cache import AuditResultCache, parse_with_cache
+
+DEFAULT_PATH = os.environ.get(
+    'AUDIT_JOBS_DB', os.path.join(tempfile.gettempdir(), 'coursescope-audit-jobs.sqlite3'))
+# Worker threads started in each process that accepts async uploads; 0 leaves
+# parsing to a standalone worker
+DEFAULT_WORKERS = int(os.environ.get('AUDIT_JOB_WORKERS', 2))
+# Finished jobs (and their results) are kept this long for polling
+RESULT_TTL_SECONDS = int(os.environ.get('AUDIT_JOB_TTL', 60 * 60))
+POLL_INTERVAL_SECONDS = 0.5
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS audit_jobs (
+        id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        pdf BLOB,
+        requirements TEXT,
+        result TEXT,
+        error TEXT,
+        created_at REAL NOT NULL,
+        started_at REAL,
+        finished_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_audit_jobs_status ON audit_jobs (status, created_at);
+'''
+
+def requirement_sets(required: Iterable[str], electives: Iterable[str]) -> Dict:
+    """Major requirement codes captured at upload time, so workers never need the catalog."""
+    return {'required': sorted(required), 'electives': sorted(electives)}
+
+REQUIRED_CODES_QUERY = 'SELECT course_code FROM major_requirements WHERE major_id = ?'
+ELECTIVE_CODES_QUERY = 'SELECT course_code FROM major_electives WHERE major_id = ?'
+
+def load_requirement_codes(connect: Callable[[], sqlite3.Connection], major_id) -> Tuple[Set[str], Set[str]]:
+    """(required codes, elective codes) for a major; connect opens the catalog database."""
+    mid = int(major_id)
+    conn = connect()
+    try:
+        required = {row[0] for row in conn.execute(REQUIRED_CODES_QUERY, (mid,))}
+        electives = {row[0] for row in conn.execute(ELECTIVE_CODES_QUERY, (mid,))}
+    finally:
+        conn.close()
+    return required, electives
+
+class AuditJobQueue:
+    """
+    Durable FIFO of audit parse jobs in a SQLite file.
+    Jobs move queued -> running -> done | failed. The PDF is dropped once the
+    job finishes and finished jobs are purged after result_ttl seconds.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, workers: int = DEFAULT_WORKERS,
+                 result_ttl: int = RESULT_TTL_SECONDS, cache: Optional[AuditResultCache] = None):
+        self.path = path
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self.cache = cache if cache is not None else AuditResultCache()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        with self._connection() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        # One short-lived connection per operation keeps threads independent
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def submit(self, pdf_bytes: bytes, requirements: Optional[Dict] = None) -> str:
+        """
+        Queue a PDF for parsing and return the job id.
+        requirements: requirement_sets(...) for a major, {'error': message} if
+        they could not be loaded, or None when no summary is wanted.
+        """
+        job_id = uuid.uuid4().hex
+        with self._connection() as conn:
+            conn.execute(
+                'INSERT INTO audit_jobs (id, status, pdf, requirements, created_at) VALUES (?, ?, ?, ?, ?)',
+                (job_id, QUEUED, sqlite3.Binary(pdf_bytes),
+                 json.dumps(requirements) if requirements is not None else None, time.time()))
+        self.start_workers()
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Job status for polling, with the result once done; None if unknown or expired."""
+        with self._connection() as conn:
+            row = conn.execute(
+                'SELECT id, status, result, error, created_at, started_at, finished_at '
+                'FROM audit_jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = {
+            'id': row['id'],
+            'status': row['status'],
+            'createdAt': row['created_at'],
+            'startedAt': row['started_at'],
+            'finishedAt': row['finished_at'],
+        }
+        if row['status'] == QUEUED:
+            job['position'] = self._position(row['created_at'])
+        if row['result'] is not None:
+            job['result'] = json.loads(row['result'])
+        if row['error'] is not None:
+            job['error'] = row['error']
+        return job
+
+    def _position(self, created_at: float) -> int:
+        with self._connection() as conn:
+            return conn.execute(
+                'SELECT COUNT(*) FROM audit_jobs WHERE status = ? AND created_at < ?',
+                (QUEUED, created_at)).fetchone()[0]
+
+    def claim(self):
+        """Take the oldest queued job: (job_id, pdf_bytes, requirements) or None."""
+        conn = self._connect()
+        try:
+            # IMMEDIATE takes the write lock up front so two workers never claim the same job
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                'SELECT id, pdf, requirements FROM audit_jobs WHERE status = ? '
+                'ORDER BY created_at LIMIT 1', (QUEUED,)).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+            conn.execute('UPDATE audit_jobs SET status = ?, started_at = ? WHERE id = ?',
+                         (RUNNING, time.time(), row['id']))
+            conn.execute('COMMIT')
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        requirements = json.loads(row['requirements']) if row['requirements'] else None
+        return row['id'], bytes(row['pdf']), requirements
+
+    def _finish(self, job_id: str, status: str, result=None, error=None) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                'UPDATE audit_jobs SET status = ?, result = ?, error = ?, finished_at = ?, pdf = NULL '
+                'WHERE id = ?',
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id))
+
+    def process(self, pdf_bytes: bytes, requirements: Optional[Dict]) -> Dict:
+        """Same payload the synchronous upload endpoint returns."""
+        parsed, _ = parse_with_cache(pdf_bytes, parse_pdf, self.cache, namespace=PARSER_VERSION)
+        summary = None
+        if requirements is not None:
+            if 'error' in requirements:
+                summary = {'error': requirements['error']}
+            else:
+                summary = summarize(parsed, set(requirements['required']), set(requirements['electives']))
+        return {
+            'parsed': {k: sorted(list(v)) for k, v in parsed.items()},
+            'summary': summary
+        }
+
+    def run_next(self) -> bool:
+        """Process one queued job. Returns False when the queue was empty."""
+        claimed = self.claim()
+        if claimed is None:
+            return False
+        job_id, pdf_bytes, requirements = claimed
+        try:
+            result = self.process(pdf_bytes, requirements)
+        except Exception as e:
+            self._finish(job_id, FAILED, error=f'Failed to parse PDF: {e}')
+        else:
+            self._finish(job_id, DONE, result=result)
+        return True
+
+    def purge(self) -> None:
+        """Delete finished jobs older than the result TTL."""
+        with self._connection() as conn:
+            conn.execute('DELETE FROM audit_jobs WHERE status IN (?, ?) AND finished_at < ?',
+                         (DONE, FAILED, time.time() - self.result_ttl))
+
+    def requeue_stale(self, older_than: float) -> None:
+        """Return jobs stuck in running (e.g. their worker died) to the queue."""
+        with self._connection() as conn:
+            conn.execute('UPDATE audit_jobs SET status = ?, started_at = NULL '
+                         'WHERE status = ? AND started_at < ?',
+                         (QUEUED, RUNNING, time.time() - older_than))
+
+    def work(self, stop: Optional[threading.Event] = None) -> None:
+        """Worker loop: drain the queue, then wait for new jobs."""
+        while stop is None or not stop.is_set():
+            if self.run_next():
+                continue
+            self.purge()
+            self._wakeup.wait(POLL_INTERVAL_SECONDS)
+            self._wakeup.clear()
+
+    def start_workers(self) -> None:
+        """Start the in-process worker threads once."""
+        with self._lock:
+            if self._threads or self.workers <= 0:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self.work, name=f'audit-worker-{index}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+if __name__ == '__main__':
+    queue = AuditJobQueue(workers=0)
+    # Anything left running by a crashed worker gets another chance
+    queue.requeue_stale(older_than=300)
+    print(f"Audit worker processing jobs from {queue.path}")
+    queue.work()
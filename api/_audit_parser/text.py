@@ -0,0 +1,135 @@
+"""Audit text parsing: line classification and course extraction."""
+import os
+import re
+from typing import Dict, Optional, Set, Iterable
+
+from _course_codes import make_code
+
+# Lines marking trailing sections that never list courses, separated by "|".
+# Parsing (and page extraction) stops at the first line containing one.
+END_MARKERS = tuple(m.strip() for m in os.environ.get("AUDIT_END_MARKERS", "").split("|") if m.strip())
+
+# Pattern to match semester+course patterns like "FA22 MATH 121" or "FA22MATH121" (with or without spaces)
+SEMESTER_COURSE_PATTERN = re.compile(r"\b(FA|SP|SU|WS|SS)\d{2}\s*([A-Z]{2,4})\s+(\d{2,3})([A-Z]{1,2})?\b")
+
+STATUS_KEYWORDS = {
+    "in_progress": ["In Progress", "IP", "In-Progress", "CURRENT"],
+    "completed": ["Completed", "Satisfied", "OK", "Earned"],
+    "planned": ["Planned", "PLAN", "Future"],
+    "needed": ["Needed", "Not Met", "Remaining", "Still Needed"],
+}
+GRADE_PATTERN = re.compile(r"\b([ABCDF][+-]?)\b")
+
+# Status keywords lowercased once, in priority order
+_LOWERED_STATUS_KEYWORDS = tuple(
+    (status, tuple(kw.lower() for kw in keywords)) for status, keywords in STATUS_KEYWORDS.items()
+)
+
+# A grade right after the credit hours on a course line (e.g. "3.00 A ")
+CREDIT_GRADE_PATTERN = re.compile(r"\d+\.\d+\s+([A-Z][+-]?)\s+")
+
+def _keyword_status(lowered: str) -> Optional[str]:
+    """First status whose keyword appears in an already-lowercased line."""
+    for status, keywords in _LOWERED_STATUS_KEYWORDS:
+        for kw in keywords:
+            if kw in lowered:
+                return status
+    return None
+
+class AuditTextParser:
+    """
+    Incremental audit parser: feed page texts in document order.
+    The section status carries across page boundaries, and parsing stops at the
+    first line containing one of end_markers.
+    """
+
+    def __init__(self, end_markers: Iterable[str] = ()):
+        self.completed: Set[str] = set()
+        self.in_progress: Set[str] = set()
+        self.current_status: Optional[str] = None
+        self.end_markers = [m.lower() for m in end_markers if m]
+        self.finished = False
+        self.saw_text = False
+
+    def feed(self, text: str) -> bool:
+        """Parse one chunk of text (usually a page). Returns False once parsing is finished."""
+        if self.finished:
+            return False
+        if text.strip():
+            self.saw_text = True
+        for line in text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            if self.end_markers and self._is_end_marker(line):
+                self.finished = True
+                return False
+            self._parse_line(line)
+        return True
+
+    def feed_pages(self, pages: Iterable[str]) -> None:
+        """Consume pages until they run out or an end marker is reached."""
+        try:
+            for text in pages:
+                if not self.feed(text):
+                    break
+        finally:
+            # Stop the extractor so remaining pages are never rendered
+            close = getattr(pages, 'close', None)
+            if close is not None:
+                close()
+
+    def result(self) -> Dict[str, Set[str]]:
+        """Parsed course sets, in the shape every caller of parse_pdf expects."""
+        return {
+            "completed": self.completed,
+            "in_progress": self.in_progress,
+            "planned": set(),
+            "needed": set()
+        }
+
+    def _is_end_marker(self, line: str) -> bool:
+        lowered = line.lower()
+        return any(marker in lowered for marker in self.end_markers)
+
+    def _parse_line(self, line: str) -> None:
+        # Classify the line to determine status; the line is lowercased once
+        line_status = _keyword_status(line.lower())
+        if line_status is None and GRADE_PATTERN.search(line):
+            line_status = 'completed'
+        if line_status:
+            self.current_status = line_status
+
+        # One scan both detects and extracts semester+course patterns (FA22 MATH 121)
+        matches = SEMESTER_COURSE_PATTERN.findall(line)
+        if not matches:
+            return
+
+        # Determine status based on grade or position in document
+        if CREDIT_GRADE_PATTERN.search(line):
+            # If there's a grade, it's completed
+            line_status = 'completed'
+        elif 'IP' in line or 'IN PROGRESS' in line.upper():
+            line_status = 'in_progress'
+        elif self.current_status:
+            # Use the current section status
+            line_status = self.current_status
+        else:
+            # Default to completed if uncertain
+            line_status = 'completed'
+
+        if line_status == 'completed':
+            target = self.completed
+        elif line_status == 'in_progress':
+            target = self.in_progress
+        else:
+            return
+        # Canonical database format ("CS 141")
+        for _semester, dept, num, suffix in matches:
+            target.add(make_code(dept, num + suffix))
+
+def parse_text(text, end_markers: Iterable[str] = END_MARKERS) -> Dict[str, Set[str]]:
+    """Parse extracted text to find completed and in-progress courses."""
+    parser = AuditTextParser(end_markers)
+    parser.feed(text)
+    return parser.result()
@@ -0,0 +1,194 @@
+from collections import defaultdict
+
+import _db
+from _fastjson import dumps
+from _course_codes import CourseCodeIndex, frontend_id
+from _db import (get_db_connection, check_course_id_columns, get_catalog_version, get_prerequisite_index,
+                 NO_PREREQUISITES, estimate_difficulty, parse_credits)
+from _grade_arrays import get_grade_arrays, difficulty_labels, recency_difficulty
+
+# Values of the difficultyModel parameter: 'alltime' pools every term equally
+# (the original label), 'recent' uses the recency-weighted A+B rate
+DIFFICULTY_MODELS = ('alltime', 'recent')
+DEFAULT_DIFFICULTY_MODEL = 'alltime'
+
+# JSON layout shared by every course response; keys stay in the order the
+# frontend has always received them
+_COURSE_JSON = (b'{"id":%b,"code":%b,"title":%b,"credits":%b,'
+                b'"creditsUndergrad":%b,"creditsGrad":%b,"level":%b,'
+                b'"difficulty":%b,"description":%b,"prerequisiteGroups":%b,'
+                b'"prerequisitesFormatted":%b')
+
+class Course:
+    """
+    Read-only course record built once per catalog version.
+    All derived fields (frontend id, parsed credits, difficulty, prerequisites)
+    and the encoded JSON fragment are computed at load time so requests never
+    rebuild or re-serialize them.
+    """
+    __slots__ = ('course_id', 'id', 'code', 'title', 'credits_undergrad',
+                 'credits_grad', 'level', 'difficulty', 'description',
+                 'prerequisite_groups', 'prerequisite_ids', 'prerequisites_formatted',
+                 'recent_difficulty', 'difficulty_score', 'difficulty_trend',
+                 'fragment', 'fragments')
+
+    def __init__(self, row, difficulty, prereq_data, recency=None):
+        self.course_id = row['id']
+        self.id = frontend_id(row['course_code'])
+        self.code = row['course_code']
+        self.title = row['title']
+        self.credits_undergrad = row['credits_undergrad'] or parse_credits(row['credits'])
+        self.credits_grad = row['credits_grad'] or parse_credits(row['credits'])
+        self.level = row['level']
+        self.difficulty = difficulty
+        self.description = row['description']
+        self.prerequisite_groups = prereq_data['groups']
+        # Filled in by Catalog once every code has an interned id
+        self.prerequisite_ids = ()
+        self.prerequisites_formatted = prereq_data['formatted']
+        # Recency-weighted label, A+B rate and trend; courses without grade
+        # data keep their all-time label under every model
+        self.recent_difficulty, self.difficulty_score, self.difficulty_trend = (
+            recency or (difficulty, None, None))
+        self.fragment = self._encode_fragment(self.difficulty)
+        recent = b',"difficultyModel":"recent","difficultyScore":%b,"difficultyTrend":%b}' % (
+            dumps(self.difficulty_score), dumps(self.difficulty_trend))
+        self.fragments = {'alltime': self.fragment,
+                          'recent': self._encode_fragment(self.recent_difficulty)[:-1] + recent}
+
+    def prerequisites_met(self, completed_ids):
+        """
+        completed_ids: set of interned course ids (Catalog.codes.ids(...)).
+        Groups are AND'd together, items within a group are OR'd.
+        """
+        for group in self.prerequisite_ids:
+            if completed_ids.isdisjoint(group):
+                return False
+        return True
+
+    def _encode_fragment(self, difficulty):
+        return _COURSE_JSON % (
+            dumps(self.id), dumps(self.code), dumps(self.title),
+            dumps(self.credits_undergrad), dumps(self.credits_undergrad),
+            dumps(self.credits_grad), dumps(self.level),
+            dumps(difficulty), dumps(self.description),
+            dumps(self.prerequisite_groups), dumps(self.prerequisites_formatted)
+        ) + b'}'
+
+    def to_json(self, extra=None, model=DEFAULT_DIFFICULTY_MODEL):
+        """
+        Get this course as JSON bytes under a difficulty model.
+        extra: optional (key, value) pairs spliced in after the standard fields;
+        only those values are encoded, the prebuilt fragment is reused as-is.
+        """
+        fragment = self.fragments[model]
+        if not extra:
+            return fragment
+        tail = b''.join(b',%b:%b' % (dumps(key), dumps(value)) for key, value in extra)
+        return fragment[:-1] + tail + b'}'
+
+def parse_difficulty_model(value):
+    """
+    Validate a difficultyModel query parameter (None means the default).
+    Raises ValueError with a client-facing message for unknown models.
+    """
+    if value is None or value == '':
+        return DEFAULT_DIFFICULTY_MODEL
+    if value not in DIFFICULTY_MODELS:
+        raise ValueError(f"Unknown difficultyModel '{value}' (expected one of: {', '.join(DIFFICULTY_MODELS)})")
+    return value
+
+def serialize_courses(courses, model=DEFAULT_DIFFICULTY_MODEL):
+    """Join the prebuilt fragments of an iterable of Course records into a JSON array."""
+    if model == DEFAULT_DIFFICULTY_MODEL:
+        return b'[' + b','.join([course.fragment for course in courses]) + b']'
+    return b'[' + b','.join([course.fragments[model] for course in courses]) + b']'
+
+def iter_ndjson(courses, model=DEFAULT_DIFFICULTY_MODEL):
+    """Yield one prebuilt course fragment per line for streaming responses."""
+    for course in courses:
+        yield course.fragments[model] + b'\n'
+
+class Catalog:
+    """Snapshot of every course for one catalog version."""
+    __slots__ = ('version', 'courses', 'by_code', 'by_id', 'codes', 'positions', 'dependents',
+                 'courses_json', 'model_json')
+
+    def __init__(self, version, courses):
+        self.version = version
+        self.courses = courses
+        self.by_code = {course.code: course for course in courses}
+        self.by_id = {course.course_id: course for course in courses}
+        # Every spelling of every code resolves to an integer id; prerequisite
+        # groups are stored as id sets so eligibility checks compare ints
+        self.codes = CourseCodeIndex((course.course_id, course.code) for course in courses)
+        for course in courses:
+            course.prerequisite_ids = tuple(
+                frozenset(self.codes.intern(code) for code in group)
+                for group in course.prerequisite_groups)
+        self.positions = {course.course_id: position for position, course in enumerate(courses)}
+        # Reverse dependencies: id -> courses naming it in any prerequisite group,
+        # so a change to a completed set only re-evaluates those courses
+        dependents = defaultdict(list)
+        for course in courses:
+            for prerequisite_id in set().union(*course.prerequisite_ids):
+                dependents[prerequisite_id].append(course)
+        self.dependents = {prerequisite_id: tuple(dependent)
+                           for prerequisite_id, dependent in dependents.items()}
+        # The full-catalog response is identical for every request of a model
+        self.model_json = {model: serialize_courses(courses, model) for model in DIFFICULTY_MODELS}
+        self.courses_json = self.model_json[DEFAULT_DIFFICULTY_MODEL]
+
+    def find(self, code):
+        """Course for any spelling of its code ("CS 141", "cs141", ...), or None."""
+        return self.by_id.get(self.codes.lookup(code))
+
+COURSES_QUERY = '''
+    SELECT id, course_code, course_number, title, credits, credits_undergrad, credits_grad, description, level, difficulty
+    FROM courses
+    ORDER BY course_number
+'''
+
+_catalog_cache = {'version': None, 'catalog': None}
+
+def get_catalog():
+    """Get the course snapshot, loading it only when the database changes."""
+    version = get_catalog_version()
+    if _catalog_cache['version'] == version:
+        return _catalog_cache['catalog']
+
+    prereq_index = get_prerequisite_index()
+
+    conn = get_db_connection()
+    # Grade rows are matched to courses by course_id; fail with the fix rather than a bare SQL error
+    try:
+        check_course_id_columns(conn)
+    except RuntimeError:
+        conn.close()
+        raise
+    cursor = conn.cursor()
+
+    cursor.execute(COURSES_QUERY)
+    rows = cursor.fetchall()
+
+    conn.close()
+
+    # Both difficulty models come from the columnar grade counts: the
+    # all-time label pools every term, the recent one weights by term age
+    grades = get_grade_arrays(_db.DATABASE)
+    grades_by_course = dict(zip(grades.course_ids.tolist(), difficulty_labels(grades.per_course())))
+    recency_by_course = recency_difficulty(grades)
+
+    courses = []
+    for row in rows:
+        # Grade data first, then the scraped estimate, then the course level
+        difficulty = grades_by_course.get(row['id'])
+        if difficulty is None:
+            difficulty = row['difficulty'] or estimate_difficulty(row['level'])
+        courses.append(Course(row, difficulty, prereq_index.get(row['id'], NO_PREREQUISITES),
+                              recency_by_course.get(row['id'])))
+
+    catalog = Catalog(version, courses)
+    _catalog_cache['version'] = version
+    _catalog_cache['catalog'] = catalog
+    return catalog
@@ -0,0 +1,112 @@
+"""
+Course code normalization and interned integer course ids.
+
+Codes arrive in several spellings: "CS 141" (the database form), "CS141",
+"cs141" (the frontend id), "CS\xa0141" from scraped catalog HTML, and with
+letter suffixes such as "MATH 180H". normalize_code() maps all of them to the
+canonical "DEPT NUM" form, and CourseCodeIndex maps every precomputed spelling
+of a catalog code to the course's integer id, so hot paths compare ints
+instead of re-normalizing strings.
+
+Shared by the Vercel handlers, the Flask API (via ../api on sys.path), the
+audit parser and the backend importers.
+"""
+import re
+
+# Department letters, optional whitespace (NBSP included), number with an optional letter suffix
+_CODE_PATTERN = re.compile(r'([A-Za-z]{2,5})\s*(\d{2,3}[A-Za-z]{0,2})')
+
+def normalize_code(code):
+    """
+    Canonical "DEPT NUM" form of a course code, e.g. "cs141" -> "CS 141".
+    Strings that do not look like a course code are only whitespace-collapsed
+    and upper-cased, so they still compare consistently.
+    """
+    if code is None:
+        return None
+    match = _CODE_PATTERN.fullmatch(code.strip())
+    if match is None:
+        return ' '.join(code.split()).upper()
+    return f"{match.group(1).upper()} {match.group(2).upper()}"
+
+def parse_code_list(value, field):
+    """
+    Validate a list of course codes from a request body.
+    Raises ValueError with a client-facing message unless value is a list of strings.
+    """
+    if not isinstance(value, list) or not all(isinstance(code, str) for code in value):
+        raise ValueError(f"{field} must be a list of course code strings")
+    return value
+
+def make_code(dept, number):
+    """Canonical code from separate department and number fields (CSV and scraper columns)."""
+    return normalize_code(f"{dept} {number}")
+
+def split_code(code):
+    """(department, number) of a course code, or None if it is not one."""
+    match = _CODE_PATTERN.fullmatch(code.strip())
+    if match is None:
+        return None
+    return match.group(1).upper(), match.group(2).upper()
+
+def frontend_id(code):
+    """Id the frontend uses for a course, e.g. "CS 141" -> "cs141"."""
+    return normalize_code(code).replace(' ', '').lower()
+
+def _spellings(canonical):
+    compact = canonical.replace(' ', '')
+    return (canonical, compact, compact.lower(), canonical.lower())
+
+class CourseCodeIndex:
+    """
+    Every known spelling of a course code mapped to one interned integer id.
+    Catalog courses keep their courses.id; codes that only appear elsewhere
+    (e.g. prerequisites for courses that were never scraped) get negative ids
+    from intern() so they can take part in int comparisons too.
+    Built once per catalog version; lookups never mutate it.
+    """
+    __slots__ = ('_ids', '_codes', '_next_unlisted')
+
+    def __init__(self, rows=()):
+        """rows: (course id, course code) pairs from the courses table."""
+        self._ids = {}
+        self._codes = {}
+        self._next_unlisted = -1
+        for course_id, code in rows:
+            self._add(course_id, normalize_code(code))
+
+    def _add(self, course_id, canonical):
+        self._codes[course_id] = canonical
+        for spelling in _spellings(canonical):
+            self._ids.setdefault(spelling, course_id)
+
+    def lookup(self, code):
+        """Interned id of any spelling of code, or None if it is unknown."""
+        course_id = self._ids.get(code)
+        if course_id is None and isinstance(code, str):
+            course_id = self._ids.get(normalize_code(code))
+        return course_id
+
+    def intern(self, code):
+        """Id for code, assigning a new negative id if it is not known yet."""
+        course_id = self.lookup(code)
+        if course_id is None:
+            course_id = self._next_unlisted
+            self._next_unlisted -= 1
+            self._add(course_id, normalize_code(code))
+        return course_id
+
+    def ids(self, codes):
+        """Set of interned ids for an iterable of codes; unknown codes are dropped."""
+        lookup = self.lookup
+        return {course_id for course_id in map(lookup, codes) if course_id is not None}
+
+    def code(self, course_id):
+        """Canonical code for an interned id."""
+        return self._codes.get(course_id)
+
+    def __contains__(self, code):
+        return self.lookup(code) is not None
+
+    def __len__(self):
+        return len(self._codes)
@@ -7,12 +7,70 @@ import re
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATABASE = os.path.join(BASE_DIR, 'uic_courses.db')
 
+def use_database(path):
+    """Point every helper here (and the catalog built on them) at another database file."""
+    global DATABASE
+    DATABASE = path
+
 def get_db_connection():
     """Get database connection with row factory"""
     conn = sqlite3.connect(DATABASE)
     conn.row_factory = sqlite3.Row
     return conn
 
+# Catalog reads shared by the Vercel handlers and the Flask API; backend/add_indexes.py
+# checks the query plan of each
+PREREQUISITES_QUERY = '''
+    SELECT course_id, prerequisite_code, group_id
+    FROM prerequisites
+    ORDER BY course_id, group_id, prerequisite_code
+'''
+MAJORS_QUERY = '''
+    SELECT id, name, concentration
+    FROM majors
+    ORDER BY name, concentration
+'''
+MAJOR_QUERY = 'SELECT name, concentration FROM majors WHERE id = ?'
+# Course ids of a major's required and elective courses, in listing order
+MAJOR_REQUIREMENTS_QUERY = '''
+    SELECT course_id, requirement_type
+    FROM major_requirements
+    WHERE major_id = ?
+    ORDER BY requirement_type, course_code
+'''
+MAJOR_ELECTIVES_QUERY = '''
+    SELECT course_id, elective_type
+    FROM major_electives
+    WHERE major_id = ?
+    ORDER BY elective_type, course_code
+'''
+
+# Tables given an integer course_id column by backend/migrate_course_ids.py;
+# the catalog, grade and requirement queries all join on it
+COURSE_ID_TABLES = ('grade_distributions', 'major_requirements', 'major_electives')
+
+def check_course_id_columns(conn):
+    """Raise RuntimeError naming the migration if the database predates the course_id columns."""
+    missing = [table for table in COURSE_ID_TABLES
+               if not any(row[1] == 'course_id' for row in conn.execute(f'PRAGMA table_info({table})'))]
+    if missing:
+        raise RuntimeError(
+            f"Database {DATABASE} has no course_id column in {', '.join(missing)}; "
+            f"run backend/migrate_course_ids.py {DATABASE} to add and backfill it")
+
+# Precomputed grade tables written by backend/build_grade_rollups.py; the
+# grades, instructor and department endpoints read only these
+ROLLUP_TABLES = ('grade_rollups', 'instructor_course_stats', 'department_grade_rollups')
+
+def check_rollup_tables(conn):
+    """Raise RuntimeError naming the rebuild script if the database has no precomputed grade tables."""
+    present = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    missing = [table for table in ROLLUP_TABLES if table not in present]
+    if missing:
+        raise RuntimeError(
+            f"Database {DATABASE} has no {', '.join(missing)} table; "
+            f"run backend/build_grade_rollups.py {DATABASE} to build it")
+
 def parse_credits(credits_str):
     """Parse credits string and extract numeric value"""
     if not credits_str:
@@ -60,91 +118,60 @@ def format_prerequisites_from_list(prereq_list):
         'formatted': formatted
     }
 
-def get_prerequisites_grouped(course_id):
+def get_catalog_version():
+    """Return a token that changes whenever the database file is rebuilt."""
+    stat = os.stat(DATABASE)
+    return (stat.st_mtime_ns, stat.st_size)
+
+# Prebuilt prerequisite structures for the current catalog version only
+_prerequisite_cache = {'version': None, 'index': {}}
+NO_PREREQUISITES = {'groups': [], 'formatted': 'None'}
+
+def get_prerequisite_index():
     """
-    Get prerequisites grouped by group_id.
-    Returns: {
-        'groups': [[course1, course2], [course3], ...],
-        'formatted': 'string representation'
-    }
+    Get grouped and formatted prerequisites for every course, keyed by course id.
+    Built once per catalog version; callers must treat the values as read-only.
     """
+    version = get_catalog_version()
+    if _prerequisite_cache['version'] == version:
+        return _prerequisite_cache['index']
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
-    cursor.execute('''
-        SELECT prerequisite_code, group_id
-        FROM prerequisites
-        WHERE course_id = ?
-        ORDER BY group_id, prerequisite_code
-    ''', (course_id,))
+    cursor.execute(PREREQUISITES_QUERY)
 
-    prereq_rows = cursor.fetchall()
+    prereqs_by_course = defaultdict(list)
+    for row in cursor.fetchall():
+        prereqs_by_course[row['course_id']].append({
+            'code': row['prerequisite_code'],
+            'group': row['group_id']
+        })
     conn.close()
 
-    if not prereq_rows:
-        return {'groups': [], 'formatted': 'None'}
-
-    groups_dict = defaultdict(list)
-    for row in prereq_rows:
-        groups_dict[row['group_id']].append(row['prerequisite_code'])
-
-    groups = [groups_dict[gid] for gid in sorted(groups_dict.keys())]
-
-    formatted_parts = []
-    for group in groups:
-        if len(group) == 1:
-            formatted_parts.append(group[0])
-        else:
-            formatted_parts.append('(' + ' or '.join(group) + ')')
+    index = {course_id: format_prerequisites_from_list(prereq_list)
+             for course_id, prereq_list in prereqs_by_course.items()}
 
-    formatted = ' and '.join(formatted_parts) if formatted_parts else 'None'
+    _prerequisite_cache['version'] = version
+    _prerequisite_cache['index'] = index
+    return index
 
-    return {
-        'groups': groups,
-        'formatted': formatted
-    }
+# Catalog version whose rollup tables have been checked
+_rollup_check = {'version': None}
 
-def get_difficulty_from_grades(course_code):
+def get_grades_connection():
     """
-    Calculate difficulty based on grade distribution data.
-    Returns difficulty string or None if no data available.
+    get_db_connection() for the grade endpoints. Checks the rollup tables once
+    per catalog version so a missing build fails with check_rollup_tables'
+    message instead of "no such table".
     """
+    version = get_catalog_version()
     conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('''
-        SELECT
-            SUM(gd.grade_a) as total_a,
-            SUM(gd.grade_b) as total_b,
-            SUM(gd.grade_c) as total_c,
-            SUM(gd.grade_d) as total_d,
-            SUM(gd.grade_f) as total_f
-        FROM grade_distributions gd
-        WHERE gd.course_code = ?
-    ''', (course_code,))
-
-    result = cursor.fetchone()
-    conn.close()
-
-    if not result or result['total_a'] is None:
-        return None
-
-    total_a = result['total_a'] or 0
-    total_b = result['total_b'] or 0
-    total_c = result['total_c'] or 0
-    total_d = result['total_d'] or 0
-    total_f = result['total_f'] or 0
-
-    total_letter_grades = total_a + total_b + total_c + total_d + total_f
-
-    if total_letter_grades == 0:
-        return None
-
-    ab_percentage = ((total_a + total_b) / total_letter_grades) * 100
-
-    if ab_percentage >= 70:
-        return "Light"
-    elif ab_percentage >= 50:
-        return "Moderate"
-    else:
-        return "Challenging"
+    if _rollup_check['version'] != version:
+        try:
+            check_rollup_tables(conn)
+        except RuntimeError:
+            conn.close()
+            raise
+        _rollup_check['version'] = version
+    return conn
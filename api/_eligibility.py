@@ -0,0 +1,118 @@
+"""
+Eligibility with memoization of identical completed sets.
+
+Many students submit the same completed courses (a cohort's shared intro
+sequence), so results are kept in a bounded LRU keyed by the catalog version
+and a hash of the canonical completed set: normalized codes, deduplicated and
+sorted, so "cs141" and "CS 141" in any order share an entry.
+
+eligibility_delta() answers "what changes if I add or drop these courses"
+from the catalog's reverse-dependency index, touching only the courses that
+name a changed code as a prerequisite.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from _course_codes import normalize_code
+
+# Defaults can be tuned per deployment without code changes
+DEFAULT_MAX_ENTRIES = int(os.environ.get('ELIGIBILITY_CACHE_MAX_ENTRIES', 1024))
+
+def completed_digest(completed):
+    """Canonical hash of a completed list: order, duplicates and spelling do not matter."""
+    codes = sorted({str(normalize_code(code)) for code in completed})
+    return hashlib.sha256('\n'.join(codes).encode('utf-8')).hexdigest()
+
+def compute_eligible(catalog, completed):
+    """Courses not yet completed whose prerequisites completed satisfies, in catalog order."""
+    # Any code spelling resolves to an interned id; the checks below compare ints
+    completed_ids = catalog.codes.ids(completed)
+    # Groups are AND'd together, items within a group are OR'd
+    return tuple(
+        course for course in catalog.courses
+        if course.course_id not in completed_ids
+        and course.prerequisites_met(completed_ids)
+    )
+
+class EligibilityCache:
+    """
+    Bounded LRU of eligible-course tuples per (catalog version, completed set).
+    Entries hold the catalog's own Course records, so a new catalog version
+    clears the cache rather than keeping old records alive.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def eligible(self, catalog, completed):
+        """
+        Eligible courses for completed (any code spellings) under catalog.
+        Returns (courses, cache_hit).
+        """
+        key = (catalog.version, completed_digest(completed))
+        with self._lock:
+            if self._version != catalog.version:
+                self._entries.clear()
+                self._version = catalog.version
+            courses = self._entries.get(key)
+            if courses is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return courses, True
+            self.misses += 1
+
+        courses = compute_eligible(catalog, completed)
+        with self._lock:
+            if self._version == catalog.version:
+                self._entries[key] = courses
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return courses, False
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+def _is_eligible(course, completed_ids):
+    return course.course_id not in completed_ids and course.prerequisites_met(completed_ids)
+
+def eligibility_delta(catalog, completed, added=(), removed=()):
+    """
+    Courses whose eligibility changes when added codes are completed and
+    removed codes are dropped from completed (removal wins if a code is in both).
+    Only the changed courses and their dependents are re-evaluated.
+    Returns (entered, left, evaluated): Course tuples in catalog order and
+    the number of courses checked.
+    """
+    before = catalog.codes.ids(completed)
+    added_ids = catalog.codes.ids(added)
+    removed_ids = catalog.codes.ids(removed)
+    after = (before | added_ids) - removed_ids
+
+    changed = before ^ after
+    affected = {catalog.by_id[course_id] for course_id in changed if course_id in catalog.by_id}
+    for course_id in changed:
+        affected.update(catalog.dependents.get(course_id, ()))
+
+    entered, left = [], []
+    for course in sorted(affected, key=lambda course: catalog.positions[course.course_id]):
+        was, now = _is_eligible(course, before), _is_eligible(course, after)
+        if now and not was:
+            entered.append(course)
+        elif was and not now:
+            left.append(course)
+    return tuple(entered), tuple(left), len(affected)
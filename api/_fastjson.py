@@ -0,0 +1,33 @@
+import json
+
+# orjson is much faster on large payloads; the stdlib encoder is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_LIBRARY = 'orjson' if orjson else 'json'
+
+def dumps(obj):
+    """Encode obj as compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # Types orjson refuses (e.g. ints over 64 bits) go through the stdlib
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def loads(data):
+    """Decode JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def wants_ndjson(accept_header, stream_param=None):
+    """True when the client asked for newline-delimited JSON (Accept header or ?stream=1)."""
+    if stream_param in ('1', 'true'):
+        return True
+    return NDJSON_MIMETYPE in (accept_header or '')
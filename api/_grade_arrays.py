@@ -0,0 +1,262 @@
+"""
+Columnar grade counts for vectorized analytics.
+
+grade_distributions is loaded once per catalog version into NumPy arrays: one
+row per section with its course, semester and instructor as small integer
+indexes, plus an N x 8 int32 matrix of A/B/C/D/F/W/S/U counts. Rollups by
+course, department or term are then a bincount over an index column instead
+of a Python loop over rows, so campus-wide statistics take milliseconds.
+
+The arrays are written as an uncompressed .npz next to the database (or in
+the temp directory when the deployment is read-only), tagged with the
+database version, so a cold start loads them instead of re-reading SQLite.
+"""
+import sqlite3
+import os
+import tempfile
+
+import numpy as np
+
+from _db import DATABASE
+from _course_codes import split_code
+from _grades import GRADE_LETTERS, TERM_ORDER
+
+# Columns of the count matrix
+A, B, C, D, F, W, S, U = range(len(GRADE_LETTERS))
+
+# Recency-weighted difficulty: a term's grades count half as much every this many years
+RECENCY_HALF_LIFE_YEARS = 2.0
+
+GRADE_ROWS_QUERY = '''
+    SELECT
+        gd.course_id, c.course_code, gd.semester_id, s.term, s.year, gd.instructor,
+        gd.grade_a, gd.grade_b, gd.grade_c, gd.grade_d, gd.grade_f,
+        gd.grade_w, gd.grade_s, gd.grade_u
+    FROM grade_distributions gd
+    JOIN courses c ON c.id = gd.course_id
+    JOIN semesters s ON s.id = gd.semester_id
+'''
+
+def _database_version(database):
+    stat = os.stat(database)
+    return np.array([stat.st_mtime_ns, stat.st_size], dtype=np.int64)
+
+def group_sum(index, counts, size):
+    """Sum the rows of counts that share an index value: (size, 8) int64."""
+    if not len(index):
+        return np.zeros((size, counts.shape[1]), dtype=np.int64)
+    return np.stack([np.bincount(index, weights=counts[:, column], minlength=size)
+                     for column in range(counts.shape[1])], axis=1).astype(np.int64)
+
+def percentages(totals):
+    """
+    A-F as a share of letter grades and W as a share of all students, rounded
+    to one decimal like the grades endpoint. totals: (n, 8) -> (n, 6) float64.
+    """
+    totals = np.atleast_2d(totals).astype(np.float64)
+    letters = totals[:, :W].sum(axis=1, keepdims=True)
+    students = totals.sum(axis=1, keepdims=True)
+    result = np.zeros((len(totals), 6))
+    np.divide(totals[:, :W], letters, out=result[:, :W], where=letters > 0)
+    np.divide(totals[:, W:W + 1], students, out=result[:, W:W + 1], where=students > 0)
+    return np.round(result * 100, 1)
+
+def _labels(ab_share, graded):
+    """Difficulty label per A+B percentage; None where graded is False."""
+    labels = np.where(ab_share >= 70, 'Light', np.where(ab_share >= 50, 'Moderate', 'Challenging'))
+    return [str(label) if has_grades else None for label, has_grades in zip(labels, graded)]
+
+def difficulty_labels(totals):
+    """
+    Difficulty label per row of totals (Light at 70%+ A/B, Moderate at 50%+,
+    otherwise Challenging), None where a row has no letter grades.
+    """
+    totals = np.atleast_2d(totals).astype(np.float64)
+    letters = totals[:, :W].sum(axis=1)
+    ab_share = np.divide(totals[:, A] + totals[:, B], letters,
+                         out=np.zeros(len(totals)), where=letters > 0) * 100
+    return _labels(ab_share, letters > 0)
+
+class GradeArrays:
+    """
+    One snapshot of grade_distributions in columnar form.
+    Row i is a section: course_index[i] points into course_ids/course_codes,
+    semester_index[i] into terms/years, instructor_index[i] into instructors.
+    """
+    _FIELDS = ('version', 'course_index', 'semester_index', 'instructor_index', 'counts',
+               'course_ids', 'course_codes', 'course_department', 'departments',
+               'terms', 'years', 'instructors')
+    __slots__ = _FIELDS
+
+    def __init__(self, **arrays):
+        for name in self._FIELDS:
+            setattr(self, name, arrays[name])
+
+    @classmethod
+    def from_database(cls, database=DATABASE):
+        conn = sqlite3.connect(database)
+        rows = conn.execute(GRADE_ROWS_QUERY).fetchall()
+        conn.close()
+
+        course_ids, course_index = np.unique(
+            np.array([row[0] for row in rows], dtype=np.int64), return_inverse=True)
+        code_by_id = {row[0]: row[1] for row in rows}
+        course_codes = np.array([code_by_id[int(course_id)] for course_id in course_ids], dtype=str)
+
+        semester_ids, semester_index = np.unique(
+            np.array([row[2] for row in rows], dtype=np.int64), return_inverse=True)
+        semester_by_id = {row[2]: (row[3], row[4]) for row in rows}
+        terms = np.array([semester_by_id[int(sid)][0] for sid in semester_ids], dtype=str)
+        years = np.array([semester_by_id[int(sid)][1] for sid in semester_ids], dtype=np.int32)
+
+        instructors, instructor_index = np.unique(
+            np.array([row[5] or '' for row in rows], dtype=str), return_inverse=True)
+
+        department_of = [(split_code(str(code)) or (str(code).split(' ')[0], ''))[0]
+                         for code in course_codes]
+        departments, course_department = np.unique(np.array(department_of, dtype=str),
+                                                   return_inverse=True)
+
+        return cls(
+            version=_database_version(database),
+            course_index=course_index.astype(np.int32),
+            semester_index=semester_index.astype(np.int16),
+            instructor_index=instructor_index.astype(np.int32),
+            counts=np.array([row[6:] for row in rows], dtype=np.int32).reshape(-1, len(GRADE_LETTERS)),
+            course_ids=course_ids,
+            course_codes=course_codes,
+            course_department=course_department.astype(np.int32),
+            departments=departments,
+            terms=terms,
+            years=years,
+            instructors=instructors,
+        )
+
+    def save(self, path):
+        np.savez(path, **{name: getattr(self, name) for name in self._FIELDS})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(**{name: data[name] for name in cls._FIELDS})
+
+    # Rollups: (groups, 8) int64 count matrices
+
+    def per_course(self):
+        return group_sum(self.course_index, self.counts, len(self.course_ids))
+
+    def per_department(self):
+        return group_sum(self.course_department[self.course_index], self.counts, len(self.departments))
+
+    def per_term(self):
+        return group_sum(self.semester_index, self.counts, len(self.terms))
+
+    def per_instructor(self):
+        return group_sum(self.instructor_index, self.counts, len(self.instructors))
+
+    def campus(self):
+        return self.counts.sum(axis=0, dtype=np.int64)
+
+    def per_course_term(self):
+        """(courses, terms, 8) counts: one course's sections summed per semester."""
+        terms = len(self.terms)
+        cells = self.course_index.astype(np.int64) * terms + self.semester_index
+        return group_sum(cells, self.counts, len(self.course_ids) * terms).reshape(
+            len(self.course_ids), terms, self.counts.shape[1])
+
+    def term_positions(self):
+        """Each semester as a fractional year (Spring 2024 -> 2024.25, Fall 2024 -> 2024.75)."""
+        offsets = np.array([TERM_ORDER.get(str(term), len(TERM_ORDER)) for term in self.terms])
+        return self.years + offsets / len(TERM_ORDER)
+
+    def department_mask(self, department):
+        """Boolean row mask for one department's sections (all False if unknown)."""
+        position = np.searchsorted(self.departments, department)
+        if position == len(self.departments) or self.departments[position] != department:
+            return np.zeros(len(self.counts), dtype=bool)
+        return self.course_department[self.course_index] == position
+
+def cache_paths(database):
+    """Where the .npz for database may live: next to it, then the temp directory."""
+    name = os.path.basename(database) + '.grades.npz'
+    return (os.path.join(os.path.dirname(os.path.abspath(database)), name),
+            os.path.join(tempfile.gettempdir(), 'coursescope-' + name))
+
+def recency_difficulty(arrays, half_life=RECENCY_HALF_LIFE_YEARS):
+    """
+    Recency-weighted difficulty for every course with letter grades.
+
+    The A+B rate weighs each semester by 0.5 ** (age in years / half_life), so
+    recent offerings dominate; the trend is the least-squares slope of the
+    per-semester A+B rate in percentage points per year (None with fewer than
+    two graded semesters).
+    Returns {course id: (label, A+B rate, trend)}.
+    """
+    grid = arrays.per_course_term().astype(np.float64)
+    ab = grid[:, :, A] + grid[:, :, B]
+    letters = grid[:, :, :W].sum(axis=2)
+    graded = letters > 0
+
+    positions = arrays.term_positions()
+    weights = 0.5 ** ((positions.max(initial=0) - positions) / half_life)
+    weighted_letters = letters @ weights
+    rate = np.divide(ab @ weights, weighted_letters,
+                     out=np.zeros(len(grid)), where=weighted_letters > 0) * 100
+
+    # Slope of the per-term rate over the terms each course was graded in
+    x = positions - positions.mean() if len(positions) else positions
+    y = np.divide(ab, letters, out=np.zeros_like(ab), where=graded) * 100
+    n = graded.sum(axis=1)
+    sx = graded @ x
+    sxx = graded @ (x * x)
+    sy = (y * graded).sum(axis=1)
+    sxy = (y * graded) @ x
+    denominator = n * sxx - sx * sx
+    has_trend = (n >= 2) & (denominator > 1e-9)
+    slope = np.divide(n * sxy - sx * sy, denominator,
+                      out=np.zeros(len(grid)), where=has_trend)
+
+    labels = _labels(rate, weighted_letters > 0)
+    return {
+        int(course_id): (label, round(float(score), 1),
+                         round(float(trend), 2) if trended else None)
+        for course_id, label, score, trend, trended
+        in zip(arrays.course_ids, labels, rate, slope, has_trend)
+        if label is not None
+    }
+
+_arrays_cache = {}
+
+def get_grade_arrays(database=DATABASE):
+    """
+    Grade arrays for the current version of database: from memory, else from
+    a matching .npz, else rebuilt from SQLite and written to the first
+    writable cache path.
+    """
+    version = _database_version(database)
+    cached = _arrays_cache.get(database)
+    if cached is not None and np.array_equal(cached.version, version):
+        return cached
+
+    arrays = None
+    paths = cache_paths(database)
+    for path in paths:
+        try:
+            candidate = GradeArrays.load(path)
+        except (OSError, ValueError, KeyError):
+            continue
+        if np.array_equal(candidate.version, version):
+            arrays = candidate
+            break
+
+    if arrays is None:
+        arrays = GradeArrays.from_database(database)
+        for path in paths:
+            try:
+                arrays.save(path)
+                break
+            except OSError:
+                continue
+
+    _arrays_cache[database] = arrays
+    return arrays
@@ -0,0 +1,470 @@
+"""
+Precomputed grade-distribution rollups.
+
+The grades endpoints used to fetch every row for a course and compute
+percentages and totals on each request. build_grade_rollups() does that work
+once, when grades are imported: for every course it stores one summary row
+(totals and pre-rounded percentages) together with the encoded per-section
+distributions and average, so a request is a single indexed read that splices
+prebuilt JSON.
+
+build_instructor_stats() materializes the same numbers per (instructor,
+course) in instructor_course_stats, with a term-by-term trend, for the
+instructor comparison endpoints.
+
+build_department_rollups() sums sections per (department, level, semester,
+course) into department_grade_rollups, so the department endpoint filters and
+pools a few hundred small rows instead of grouping raw sections.
+"""
+import re
+from itertools import groupby
+
+from _fastjson import dumps
+from _course_codes import split_code
+
+GRADE_LETTERS = ('A', 'B', 'C', 'D', 'F', 'W', 'S', 'U')
+
+_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS grade_rollups (
+        course_id INTEGER PRIMARY KEY REFERENCES courses(id),
+        semesters_count INTEGER NOT NULL,
+        total_students INTEGER NOT NULL,
+        grade_a INTEGER NOT NULL,
+        grade_b INTEGER NOT NULL,
+        grade_c INTEGER NOT NULL,
+        grade_d INTEGER NOT NULL,
+        grade_f INTEGER NOT NULL,
+        grade_w INTEGER NOT NULL,
+        grade_s INTEGER NOT NULL,
+        grade_u INTEGER NOT NULL,
+        pct_a REAL NOT NULL,
+        pct_b REAL NOT NULL,
+        pct_c REAL NOT NULL,
+        pct_d REAL NOT NULL,
+        pct_f REAL NOT NULL,
+        pct_w REAL NOT NULL,
+        distributions BLOB NOT NULL,
+        average BLOB NOT NULL
+    )
+'''
+
+# Every section, newest term first, in the order the endpoint has always returned
+_SECTIONS_QUERY = '''
+    SELECT
+        gd.course_id, gd.instructor, s.term, s.year,
+        gd.grade_a, gd.grade_b, gd.grade_c, gd.grade_d, gd.grade_f,
+        gd.grade_w, gd.grade_s, gd.grade_u, gd.total_students
+    FROM grade_distributions gd
+    JOIN semesters s ON gd.semester_id = s.id
+    WHERE gd.course_id IS NOT NULL
+    ORDER BY gd.course_id, s.year DESC, s.term, gd.instructor
+'''
+
+_RESPONSE_JSON = (b'{"course_code":%b,"course_title":%b,"has_data":true,'
+                  b'"distributions":%b,"average":%b}')
+
+def grade_percentages(a, b, c, d, f, w, total):
+    """Letter grades as a share of A-F, withdrawals as a share of all students; one decimal."""
+    letter_grade_total = a + b + c + d + f
+    return {
+        'A': round((a / letter_grade_total * 100), 1) if letter_grade_total > 0 else 0,
+        'B': round((b / letter_grade_total * 100), 1) if letter_grade_total > 0 else 0,
+        'C': round((c / letter_grade_total * 100), 1) if letter_grade_total > 0 else 0,
+        'D': round((d / letter_grade_total * 100), 1) if letter_grade_total > 0 else 0,
+        'F': round((f / letter_grade_total * 100), 1) if letter_grade_total > 0 else 0,
+        'W': round((w / total * 100), 1) if total > 0 else 0,
+    }
+
+def course_rollup(sections):
+    """
+    Summary row for one course from its sections
+    ((instructor, term, year, a, b, c, d, f, w, s, u, total), display order).
+    Returns the grade_rollups column values after course_id.
+    """
+    distributions = []
+    totals = [0] * len(GRADE_LETTERS)
+    total_students_all = 0
+
+    for instructor, term, year, *counts, total in sections:
+        distributions.append({
+            'instructor': instructor,
+            'semester': f"{term} {year}",
+            'term': term,
+            'year': year,
+            'grades': dict(zip(GRADE_LETTERS, counts)),
+            'percentages': grade_percentages(*counts[:6], total),
+            'total_students': total
+        })
+        for index, count in enumerate(counts):
+            totals[index] += count
+        total_students_all += total
+
+    percentages = grade_percentages(*totals[:6], total_students_all)
+    average = {
+        'grades': dict(zip(GRADE_LETTERS, totals)),
+        'percentages': percentages,
+        'total_students': total_students_all,
+        'semesters_count': len(distributions)
+    }
+    return (len(distributions), total_students_all, *totals,
+            *percentages.values(), dumps(distributions), dumps(average))
+
+def build_grade_rollups(conn):
+    """Rebuild grade_rollups from grade_distributions. Returns the number of courses."""
+    cursor = conn.cursor()
+    cursor.execute(_SCHEMA)
+    cursor.execute(_SECTIONS_QUERY)
+    rows = cursor.fetchall()
+
+    rollups = [
+        (course_id, *course_rollup(tuple(row[1:]) for row in sections))
+        for course_id, sections in groupby(rows, key=lambda row: row[0])
+    ]
+
+    cursor.execute('DELETE FROM grade_rollups')
+    cursor.executemany('''
+        INSERT INTO grade_rollups
+        (course_id, semesters_count, total_students,
+         grade_a, grade_b, grade_c, grade_d, grade_f, grade_w, grade_s, grade_u,
+         pct_a, pct_b, pct_c, pct_d, pct_f, pct_w, distributions, average)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rollups)
+    conn.commit()
+    return len(rollups)
+
+# Course and its rollup in one read: the course by its unique code, the rollup by primary key
+ROLLUP_QUERY = '''
+    SELECT c.course_code, c.title, r.distributions, r.average
+    FROM courses c
+    LEFT JOIN grade_rollups r ON r.course_id = c.id
+    WHERE c.course_code = ?
+'''
+
+def grade_response(row):
+    """Response body for a ROLLUP_QUERY row; the prebuilt fragments are spliced in as-is."""
+    if row['distributions'] is None:
+        return dumps({
+            'course_code': row['course_code'],
+            'course_title': row['title'],
+            'has_data': False,
+            'message': 'No grade distribution data available for this course',
+            'distributions': [],
+            'average': None
+        })
+    return _RESPONSE_JSON % (dumps(row['course_code']), dumps(row['title']),
+                             bytes(row['distributions']), bytes(row['average']))
+
+# Chronological order of terms within a year (semesters.term sorts alphabetically)
+TERM_ORDER = {'Winter': 0, 'Spring': 1, 'Summer': 2, 'Fall': 3}
+
+_INSTRUCTOR_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS instructor_course_stats (
+        instructor TEXT NOT NULL COLLATE NOCASE,
+        course_id INTEGER NOT NULL REFERENCES courses(id),
+        terms_taught INTEGER NOT NULL,
+        total_students INTEGER NOT NULL,
+        grade_a INTEGER NOT NULL,
+        grade_b INTEGER NOT NULL,
+        grade_c INTEGER NOT NULL,
+        grade_d INTEGER NOT NULL,
+        grade_f INTEGER NOT NULL,
+        grade_w INTEGER NOT NULL,
+        grade_s INTEGER NOT NULL,
+        grade_u INTEGER NOT NULL,
+        pct_a REAL NOT NULL,
+        pct_b REAL NOT NULL,
+        pct_c REAL NOT NULL,
+        pct_d REAL NOT NULL,
+        pct_f REAL NOT NULL,
+        pct_w REAL NOT NULL,
+        first_semester TEXT NOT NULL,
+        last_semester TEXT NOT NULL,
+        trend BLOB NOT NULL,
+        PRIMARY KEY (instructor, course_id)
+    );
+    -- Both endpoints list the biggest instructor/course pairings first
+    CREATE INDEX IF NOT EXISTS idx_instructor_course_stats_course
+        ON instructor_course_stats(course_id, total_students DESC, instructor);
+    CREATE INDEX IF NOT EXISTS idx_instructor_course_stats_instructor
+        ON instructor_course_stats(instructor, total_students DESC, course_id);
+'''
+
+# Named sections only; rows without an instructor cannot be attributed
+_INSTRUCTOR_SECTIONS_QUERY = '''
+    SELECT
+        gd.course_id, gd.instructor, s.term, s.year,
+        gd.grade_a, gd.grade_b, gd.grade_c, gd.grade_d, gd.grade_f,
+        gd.grade_w, gd.grade_s, gd.grade_u, gd.total_students
+    FROM grade_distributions gd
+    JOIN semesters s ON gd.semester_id = s.id
+    WHERE gd.course_id IS NOT NULL AND gd.instructor != ''
+    ORDER BY gd.course_id, gd.instructor
+'''
+
+def _term_key(term, year):
+    return year, TERM_ORDER.get(term, len(TERM_ORDER))
+
+def instructor_course_stats(sections):
+    """
+    Stats for one instructor teaching one course, from their sections
+    ((term, year, a, b, c, d, f, w, s, u, total), any order).
+    Returns the instructor_course_stats column values after (instructor, course_id).
+    """
+    sections = sorted(sections, key=lambda section: _term_key(section[0], section[1]))
+    trend = []
+    totals = [0] * len(GRADE_LETTERS)
+    total_students_all = 0
+
+    for term, year, *counts, total in sections:
+        trend.append({
+            'semester': f"{term} {year}",
+            'term': term,
+            'year': year,
+            'total_students': total,
+            'percentages': grade_percentages(*counts[:6], total)
+        })
+        for index, count in enumerate(counts):
+            totals[index] += count
+        total_students_all += total
+
+    percentages = grade_percentages(*totals[:6], total_students_all)
+    return (len(trend), total_students_all, *totals, *percentages.values(),
+            trend[0]['semester'], trend[-1]['semester'], dumps(trend))
+
+def build_instructor_stats(conn):
+    """Rebuild instructor_course_stats from grade_distributions. Returns the number of rows."""
+    cursor = conn.cursor()
+    cursor.executescript(_INSTRUCTOR_SCHEMA)
+    cursor.execute(_INSTRUCTOR_SECTIONS_QUERY)
+    rows = cursor.fetchall()
+
+    stats = [
+        (instructor, course_id, *instructor_course_stats(tuple(row[2:]) for row in sections))
+        for (course_id, instructor), sections in groupby(rows, key=lambda row: (row[0], row[1]))
+    ]
+
+    cursor.execute('DELETE FROM instructor_course_stats')
+    cursor.executemany('''
+        INSERT INTO instructor_course_stats
+        (instructor, course_id, terms_taught, total_students,
+         grade_a, grade_b, grade_c, grade_d, grade_f, grade_w, grade_s, grade_u,
+         pct_a, pct_b, pct_c, pct_d, pct_f, pct_w, first_semester, last_semester, trend)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', stats)
+    conn.commit()
+    return len(stats)
+
+_STATS_COLUMNS = '''
+    s.instructor, s.terms_taught, s.total_students,
+    s.grade_a, s.grade_b, s.grade_c, s.grade_d, s.grade_f, s.grade_w, s.grade_s, s.grade_u,
+    s.pct_a, s.pct_b, s.pct_c, s.pct_d, s.pct_f, s.pct_w,
+    s.first_semester, s.last_semester, s.trend
+'''
+
+# The course by its unique code, then its instructors from idx_instructor_course_stats_course
+COURSE_INSTRUCTORS_QUERY = f'''
+    SELECT c.course_code, c.title, {_STATS_COLUMNS}
+    FROM courses c
+    LEFT JOIN instructor_course_stats s ON s.course_id = c.id
+    WHERE c.course_code = ?
+    ORDER BY s.total_students DESC, s.instructor
+'''
+
+# Case-insensitive name match through idx_instructor_course_stats_instructor
+INSTRUCTOR_COURSES_QUERY = f'''
+    SELECT c.course_code, c.title, {_STATS_COLUMNS}
+    FROM instructor_course_stats s
+    JOIN courses c ON c.id = s.course_id
+    WHERE s.instructor = ?
+    ORDER BY s.total_students DESC, s.course_id
+'''
+
+_LETTER_COLUMNS = tuple(f'grade_{letter.lower()}' for letter in GRADE_LETTERS)
+_PERCENT_COLUMNS = ('pct_a', 'pct_b', 'pct_c', 'pct_d', 'pct_f', 'pct_w')
+
+def _stats_json(row, head):
+    """One stats entry: head (identifying fields) plus the row's numbers, with the stored trend spliced in."""
+    entry = dict(head)
+    entry['terms_taught'] = row['terms_taught']
+    entry['total_students'] = row['total_students']
+    entry['grades'] = {letter: row[column] for letter, column in zip(GRADE_LETTERS, _LETTER_COLUMNS)}
+    # W is the withdrawal rate: withdrawals over every student, not just A-F
+    entry['percentages'] = {letter: row[column] for letter, column in zip(GRADE_LETTERS, _PERCENT_COLUMNS)}
+    entry['first_semester'] = row['first_semester']
+    entry['last_semester'] = row['last_semester']
+    return dumps(entry)[:-1] + b',"trend":' + bytes(row['trend']) + b'}'
+
+def course_instructors_response(rows):
+    """Body for /courses/<code>/instructors from COURSE_INSTRUCTORS_QUERY rows (at least one)."""
+    first = rows[0]
+    entries = [_stats_json(row, (('instructor', row['instructor']),))
+               for row in rows if row['instructor'] is not None]
+    return b'{"course_code":%b,"course_title":%b,"has_data":%b,"instructors":[%b]}' % (
+        dumps(first['course_code']), dumps(first['title']),
+        b'true' if entries else b'false', b','.join(entries))
+
+def instructor_response(rows):
+    """Body for /instructors/<name> from INSTRUCTOR_COURSES_QUERY rows (at least one)."""
+    totals = [sum(row[column] for row in rows) for column in _LETTER_COLUMNS]
+    total_students = sum(row['total_students'] for row in rows)
+    overall = {
+        'courses_taught': len(rows),
+        'terms_taught': sum(row['terms_taught'] for row in rows),
+        'total_students': total_students,
+        'grades': dict(zip(GRADE_LETTERS, totals)),
+        'percentages': grade_percentages(*totals[:6], total_students)
+    }
+    entries = [_stats_json(row, (('course_code', row['course_code']), ('course_title', row['title'])))
+               for row in rows]
+    return b'{"instructor":%b,"overall":%b,"courses":[%b]}' % (
+        dumps(rows[0]['instructor']), dumps(overall), b','.join(entries))
+
+_DEPARTMENT_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS department_grade_rollups (
+        department TEXT NOT NULL,
+        level INTEGER NOT NULL,
+        term_key INTEGER NOT NULL,
+        course_id INTEGER NOT NULL REFERENCES courses(id),
+        sections INTEGER NOT NULL,
+        total_students INTEGER NOT NULL,
+        grade_a INTEGER NOT NULL,
+        grade_b INTEGER NOT NULL,
+        grade_c INTEGER NOT NULL,
+        grade_d INTEGER NOT NULL,
+        grade_f INTEGER NOT NULL,
+        grade_w INTEGER NOT NULL,
+        grade_s INTEGER NOT NULL,
+        grade_u INTEGER NOT NULL,
+        PRIMARY KEY (department, level, term_key, course_id)
+    ) WITHOUT ROWID
+'''
+
+# One row per course and semester
+_DEPARTMENT_SECTIONS_QUERY = '''
+    SELECT
+        c.id, c.course_code, c.level, s.term, s.year, COUNT(*),
+        SUM(gd.total_students),
+        SUM(gd.grade_a), SUM(gd.grade_b), SUM(gd.grade_c), SUM(gd.grade_d), SUM(gd.grade_f),
+        SUM(gd.grade_w), SUM(gd.grade_s), SUM(gd.grade_u)
+    FROM grade_distributions gd
+    JOIN courses c ON c.id = gd.course_id
+    JOIN semesters s ON s.id = gd.semester_id
+    GROUP BY gd.course_id, gd.semester_id
+'''
+
+def term_key(term, year):
+    """Sortable integer for a semester: Spring 2024 -> 20241, Fall 2024 -> 20243."""
+    year, order = _term_key(term, year)
+    return year * 10 + order
+
+def build_department_rollups(conn):
+    """Rebuild department_grade_rollups from grade_distributions. Returns the number of rows."""
+    cursor = conn.cursor()
+    cursor.execute(_DEPARTMENT_SCHEMA)
+    cursor.execute(_DEPARTMENT_SECTIONS_QUERY)
+
+    rollups = []
+    for course_id, code, level, term, year, *counts in cursor.fetchall():
+        department = (split_code(code) or (code.split(' ')[0], ''))[0]
+        rollups.append((department, level or 0, term_key(term, year), course_id, *counts))
+
+    cursor.execute('DELETE FROM department_grade_rollups')
+    cursor.executemany('''
+        INSERT INTO department_grade_rollups
+        (department, level, term_key, course_id, sections, total_students,
+         grade_a, grade_b, grade_c, grade_d, grade_f, grade_w, grade_s, grade_u)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rollups)
+    conn.commit()
+    return len(rollups)
+
+# Range scan of the primary key; unfiltered bounds are 0 and 99999999
+DEPARTMENT_GRADES_QUERY = '''
+    SELECT r.course_id, c.course_code, c.title, r.level, r.sections, r.total_students,
+           r.grade_a, r.grade_b, r.grade_c, r.grade_d, r.grade_f, r.grade_w, r.grade_s, r.grade_u
+    FROM department_grade_rollups r
+    JOIN courses c ON c.id = r.course_id
+    WHERE r.department = ? AND r.level BETWEEN ? AND ? AND r.term_key BETWEEN ? AND ?
+'''
+
+DEPARTMENT_EXISTS_QUERY = 'SELECT 1 FROM department_grade_rollups WHERE department = ? LIMIT 1'
+
+_TERM_PATTERN = re.compile(r'(?:(winter|spring|summer|fall)\s+)?(\d{4})', re.IGNORECASE)
+
+def _parse_term(value, last):
+    """term_key for "Fall 2022" or a bare year (its first or last term). None passes through."""
+    if value is None or not value.strip():
+        return None
+    match = _TERM_PATTERN.fullmatch(value.strip())
+    if not match:
+        raise ValueError(f"Invalid term '{value}' (expected e.g. 'Fall 2022' or '2022')")
+    term, year = match.groups()
+    if term is None:
+        return int(year) * 10 + (max(TERM_ORDER.values()) if last else min(TERM_ORDER.values()))
+    return term_key(term.capitalize(), int(year))
+
+def department_grade_params(department, level=None, first=None, last=None):
+    """
+    Validate the department endpoint's path and query values.
+    Returns DEPARTMENT_GRADES_QUERY parameters; raises ValueError with a
+    client-facing message for a bad level or term.
+    """
+    if level is not None and level.strip():
+        if not level.strip().isdigit():
+            raise ValueError(f"Invalid level '{level}' (expected e.g. 300)")
+        low = high = int(level)
+    else:
+        low, high = 0, 9999
+    first_key = _parse_term(first, last=False)
+    last_key = _parse_term(last, last=True)
+    return (department.strip().upper(), low, high,
+            0 if first_key is None else first_key,
+            99999999 if last_key is None else last_key)
+
+def department_grades_response(params, rows, first=None, last=None):
+    """
+    Body for /departments/<dept>/grades from DEPARTMENT_GRADES_QUERY rows and
+    the parameters they were read with (first/last echo the term filters):
+    per-course totals (largest first) and the pooled distribution.
+    """
+    department, low, high = params[:3]
+    courses = {}
+    for course_id, code, title, course_level, sections, students, *counts in rows:
+        course = courses.get(course_id)
+        if course is None:
+            course = courses[course_id] = [code, title, course_level, 0, 0, [0] * len(GRADE_LETTERS)]
+        course[3] += sections
+        course[4] += students
+        course[5] = [total + count for total, count in zip(course[5], counts)]
+
+    entries = []
+    pooled = [0] * len(GRADE_LETTERS)
+    for code, title, course_level, sections, students, totals in sorted(
+            courses.values(), key=lambda course: (-course[4], course[0])):
+        entries.append({
+            'course_code': code,
+            'course_title': title,
+            'level': course_level,
+            'sections': sections,
+            'total_students': students,
+            'grades': dict(zip(GRADE_LETTERS, totals)),
+            'percentages': grade_percentages(*totals[:6], students)
+        })
+        pooled = [total + count for total, count in zip(pooled, totals)]
+
+    total_students = sum(entry['total_students'] for entry in entries)
+    return dumps({
+        'department': department,
+        'level': low if low == high else None,
+        'from': first.strip() if first and first.strip() else None,
+        'to': last.strip() if last and last.strip() else None,
+        'has_data': bool(entries),
+        'pooled': {
+            'courses_count': len(entries),
+            'sections': sum(entry['sections'] for entry in entries),
+            'total_students': total_students,
+            'grades': dict(zip(GRADE_LETTERS, pooled)),
+            'percentages': grade_percentages(*pooled[:6], total_students)
+        },
+        'courses': entries
+    })
@@ -0,0 +1,143 @@
+import os
+import tempfile
+
+# Request body is read in chunks of this size
+CHUNK_SIZE = 64 * 1024
+# File parts stay in memory up to this size, then spill to a temp file
+SPOOL_MAX_SIZE = int(os.environ.get('MULTIPART_SPOOL_MAX_SIZE', 1024 * 1024))
+
+class MultipartError(ValueError):
+    """The body is not valid multipart/form-data."""
+
+def get_boundary(content_type):
+    """Boundary parameter of a multipart Content-Type header, or None."""
+    for param in content_type.split(';'):
+        name, _, value = param.strip().partition('=')
+        if name.lower() == 'boundary' and value:
+            return value.strip().strip('"')
+    return None
+
+def _disposition(headers):
+    """(field name, filename or None) from a part's header block."""
+    name = filename = None
+    for line in headers.split(b'\r\n'):
+        if not line.lower().startswith(b'content-disposition:'):
+            continue
+        for param in line.split(b';')[1:]:
+            key, _, value = param.strip().partition(b'=')
+            value = value.strip().strip(b'"').decode('utf-8', 'replace')
+            if key.lower() == b'name':
+                name = value
+            elif key.lower() == b'filename':
+                filename = value
+    return name, filename
+
+def _write(sink, buffer, length):
+    # Write through a view so the chunk is not copied; the view must be
+    # released before the bytearray is resized
+    with memoryview(buffer) as view:
+        sink.write(view[:length])
+
+class _BodyReader:
+    """Reads at most `remaining` bytes from a stream, one chunk at a time."""
+
+    def __init__(self, stream, content_length, chunk_size):
+        self.stream = stream
+        self.remaining = content_length
+        self.chunk_size = chunk_size
+
+    def read(self):
+        if self.remaining <= 0:
+            return b''
+        chunk = self.stream.read(min(self.chunk_size, self.remaining))
+        if not chunk:
+            raise MultipartError('Request body ended early')
+        self.remaining -= len(chunk)
+        return chunk
+
+def parse_multipart_stream(stream, content_length, boundary, chunk_size=CHUNK_SIZE):
+    """
+    Parse a multipart/form-data body straight from stream (e.g. rfile).
+
+    The body is never held in memory as a whole: it is scanned for boundaries
+    chunk by chunk, and file parts are written to a spooled temp file that is
+    read back once at the end. Peak memory is about one copy of the uploaded
+    file, instead of the several copies split()/slicing the full body made.
+
+    Returns {field name: {'content': str | bytes, 'is_file': bool, 'filename': ...}}.
+    """
+    reader = _BodyReader(stream, content_length, chunk_size)
+    delimiter = b'--' + boundary.encode('latin-1')
+    # Inside the body, a boundary always starts on a new line
+    part_end = b'\r\n' + delimiter
+    keep = len(part_end) - 1
+
+    buffer = bytearray()
+
+    def fill():
+        chunk = reader.read()
+        if not chunk:
+            raise MultipartError('Unexpected end of multipart body')
+        buffer.extend(chunk)
+
+    # Skip the preamble up to the first boundary
+    while True:
+        index = buffer.find(delimiter)
+        if index >= 0:
+            del buffer[:index + len(delimiter)]
+            break
+        del buffer[:max(0, len(buffer) - len(delimiter) + 1)]
+        fill()
+
+    result = {}
+    while True:
+        # After a boundary: "--" closes the body, CRLF starts another part
+        while len(buffer) < 2:
+            fill()
+        if buffer[:2] == b'--':
+            break
+        if buffer[:2] != b'\r\n':
+            raise MultipartError('Malformed boundary line')
+        del buffer[:2]
+
+        while True:
+            header_end = buffer.find(b'\r\n\r\n')
+            if header_end >= 0:
+                break
+            if len(buffer) > 16 * 1024:
+                raise MultipartError('Part headers too large')
+            fill()
+        name, filename = _disposition(bytes(buffer[:header_end]))
+        del buffer[:header_end + 4]
+
+        sink = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        try:
+            # Copy the part body until the next boundary, holding back enough
+            # bytes to catch a boundary split across two chunks
+            while True:
+                index = buffer.find(part_end)
+                if index >= 0:
+                    _write(sink, buffer, index)
+                    del buffer[:index + len(part_end)]
+                    break
+                if len(buffer) > keep:
+                    flushed = len(buffer) - keep
+                    _write(sink, buffer, flushed)
+                    del buffer[:flushed]
+                fill()
+            sink.seek(0)
+            content = sink.read()
+        finally:
+            sink.close()
+
+        if name is None:
+            continue
+        if filename is not None:
+            result[name] = {'content': content, 'is_file': True, 'filename': filename}
+        else:
+            result[name] = {'content': content.decode('utf-8', 'replace'), 'is_file': False}
+
+    # Drain any epilogue so the connection stays usable
+    while reader.read():
+        pass
+    return result
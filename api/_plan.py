@@ -0,0 +1,136 @@
+"""
+What-if simulation of a multi-term course plan.
+
+Completed courses and eligibility are bitsets (Python ints): bit i is
+catalog.courses[i], and prerequisite codes missing from the catalog get bits
+after those. A prerequisite group is satisfied when its mask shares a bit with
+the taken set, so checking a course is a few integer ANDs. Each term only
+re-checks the courses taken that term and their reverse dependencies.
+"""
+from _eligibility import compute_eligible
+
+class PlanIndex:
+    """Bit positions and per-course prerequisite group masks for one catalog version."""
+    __slots__ = ('version', 'bits', 'masks')
+
+    def __init__(self, catalog):
+        self.version = catalog.version
+        self.bits = dict(catalog.positions)
+        for course in catalog.courses:
+            for group in course.prerequisite_ids:
+                for prerequisite_id in group:
+                    self.bits.setdefault(prerequisite_id, len(self.bits))
+        self.masks = {
+            course.course_id: tuple(self.mask(group) for group in course.prerequisite_ids)
+            for course in catalog.courses
+        }
+
+    def mask(self, ids):
+        """Bitset of interned ids; ids no course depends on and outside the catalog are dropped."""
+        mask = 0
+        for course_id in ids:
+            position = self.bits.get(course_id)
+            if position is not None:
+                mask |= 1 << position
+        return mask
+
+_index_cache = {'version': None, 'index': None}
+
+def get_plan_index(catalog):
+    """PlanIndex for catalog, built once per catalog version."""
+    if _index_cache['version'] != catalog.version:
+        _index_cache['index'] = PlanIndex(catalog)
+        _index_cache['version'] = catalog.version
+    return _index_cache['index']
+
+def _courses_in(mask, catalog):
+    """Catalog courses whose bits are set in mask, in catalog order."""
+    courses = []
+    while mask:
+        low = mask & -mask
+        courses.append(catalog.courses[low.bit_length() - 1])
+        mask ^= low
+    return courses
+
+def _term_courses(term):
+    """(label, codes) for a term given as {"term": ..., "courses": [...]} or a plain list."""
+    if isinstance(term, dict):
+        courses = term.get('courses', [])
+        label = term.get('term')
+    else:
+        courses, label = term, None
+    if not isinstance(courses, list) or not all(isinstance(code, str) for code in courses):
+        raise ValueError('Each term must be a list of course codes or {"term": ..., "courses": [...]}')
+    return label, courses
+
+def simulate_plan(catalog, completed, in_progress=(), terms=(), base_eligible=None):
+    """
+    Walk a plan term by term. In-progress courses count as done before the
+    first term; each planned course counts as done for the terms after it,
+    even when its own prerequisites were not met (that is reported instead).
+    base_eligible: eligible courses for completed, if already known (e.g. cached).
+    Returns one dict per term: newly eligible codes (compared with the term
+    before, or with completed alone for the first term), planned courses with
+    unmet prerequisite groups, and planned codes missing from the catalog.
+    """
+    if not isinstance(terms, list):
+        raise ValueError('terms must be a list')
+    index = get_plan_index(catalog)
+    masks = index.masks
+
+    taken_ids = catalog.codes.ids(completed)
+    taken = index.mask(taken_ids)
+    if base_eligible is None:
+        base_eligible = compute_eligible(catalog, completed)
+    eligible = index.mask(course.course_id for course in base_eligible)
+
+    def take(ids):
+        """Mark ids as taken and re-check only them and their dependents."""
+        nonlocal taken, eligible
+        new_ids = ids - taken_ids
+        if not new_ids:
+            return
+        taken_ids.update(new_ids)
+        taken |= index.mask(new_ids)
+        affected = {catalog.by_id[course_id] for course_id in new_ids if course_id in catalog.by_id}
+        for course_id in new_ids:
+            affected.update(catalog.dependents.get(course_id, ()))
+        for course in affected:
+            bit = 1 << index.bits[course.course_id]
+            if not taken & bit and all(group & taken for group in masks[course.course_id]):
+                eligible |= bit
+            else:
+                eligible &= ~bit
+
+    previous = eligible
+    take(catalog.codes.ids(in_progress))
+
+    results = []
+    for number, term in enumerate(terms, 1):
+        label, codes = _term_courses(term)
+        newly_eligible = eligible & ~previous
+        previous = eligible
+
+        unmet, unknown, planned_ids = [], [], set()
+        for code in codes:
+            course_id = catalog.codes.lookup(code)
+            if course_id is not None:
+                # Codes outside the catalog can still satisfy prerequisites
+                planned_ids.add(course_id)
+            course = catalog.by_id.get(course_id)
+            if course is None:
+                unknown.append(code)
+                continue
+            missing = [group for group, mask in zip(course.prerequisite_groups, masks[course.course_id])
+                       if not mask & taken]
+            if missing:
+                unmet.append({'code': course.code, 'missing': missing})
+
+        results.append({
+            'term': label or f"Term {number}",
+            'newlyEligible': [course.code for course in _courses_in(newly_eligible, catalog)],
+            'unmetPrerequisites': unmet,
+            'unknownCourses': unknown
+        })
+        take(planned_ids)
+    return results
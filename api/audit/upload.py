@@ -1,53 +1,30 @@
 from http.server import BaseHTTPRequestHandler
-import json
+from urllib.parse import urlparse, parse_qs
 import sys
 import os
 
-# Add parent directory to path to import audit_parser
+# Add parent directory to path to import the shared _audit_parser package
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from _fastjson import dumps
+from _multipart import MultipartError, get_boundary, parse_multipart_stream
+
 try:
-    from audit_parser import parse_pdf, summarize
+    from _audit_parser import (parse_pdf_detailed, summarize, PARSER_VERSION,
+                               AuditResultCache, parse_with_cache)
+    from _audit_parser.jobs import load_requirement_codes
     from _db import get_db_connection
     IMPORTS_OK = True
 except Exception as import_error:
     IMPORTS_OK = False
     IMPORT_ERROR = str(import_error)
 
-def parse_multipart(data, boundary):
-    """Simple multipart form data parser"""
-    try:
-        parts = data.split(boundary.encode())
-        result = {}
-        
-        for part in parts:
-            if not part or part == b'--\r\n' or part == b'--':
-                continue
-                
-            # Find the double newline that separates headers from content
-            if b'\r\n\r\n' in part:
-                headers, content = part.split(b'\r\n\r\n', 1)
-                # Remove trailing \r\n
-                content = content.rstrip(b'\r\n')
-                
-                # Parse Content-Disposition header
-                for line in headers.split(b'\r\n'):
-                    if line.startswith(b'Content-Disposition:'):
-                        # Extract field name
-                        if b'name="' in line:
-                            name_start = line.find(b'name="') + 6
-                            name_end = line.find(b'"', name_start)
-                            field_name = line[name_start:name_end].decode()
-                            
-                            # Check if it's a file
-                            if b'filename="' in line:
-                                result[field_name] = {'content': content, 'is_file': True}
-                            else:
-                                result[field_name] = {'content': content.decode(), 'is_file': False}
-        
-        return result
-    except Exception as e:
-        raise Exception(f"Multipart parsing failed: {str(e)}")
+# Parsed results of recent uploads, shared by requests served by this instance
+audit_cache = AuditResultCache() if IMPORTS_OK else None
+
+def async_requested(path):
+    value = parse_qs(urlparse(path).query).get('async', [''])[0]
+    return value.lower() in ('1', 'true')
 
 class handler(BaseHTTPRequestHandler):
     def do_POST(self):
@@ -58,7 +35,17 @@ class handler(BaseHTTPRequestHandler):
                 self.send_header('Content-Type', 'application/json')
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
-                self.wfile.write(json.dumps({'error': f'Import error: {IMPORT_ERROR}'}).encode())
+                self.wfile.write(dumps({'error': f'Import error: {IMPORT_ERROR}'}))
+                return
+            
+            # Serverless functions have no shared job storage and freeze
+            # background workers after responding, so queued jobs would never run
+            if async_requested(self.path):
+                self.send_response(501)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(dumps({'error': 'Async audit uploads are only available on the Flask backend; retry without async=1'}))
                 return
             
             content_length = int(self.headers.get('Content-Length', 0))
@@ -71,7 +58,7 @@ class handler(BaseHTTPRequestHandler):
                 self.send_header('Content-Type', 'application/json')
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
-                self.wfile.write(json.dumps({'error': 'File too large (max 10MB)'}).encode())
+                self.wfile.write(dumps({'error': 'File too large (max 10MB)'}))
                 return
             
             if not content_type.startswith('multipart/form-data'):
@@ -79,44 +66,36 @@ class handler(BaseHTTPRequestHandler):
                 self.send_header('Content-Type', 'application/json')
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
-                self.wfile.write(json.dumps({'error': 'Expected multipart/form-data'}).encode())
+                self.wfile.write(dumps({'error': 'Expected multipart/form-data'}))
                 return
             
             # Extract boundary
-            boundary = None
-            for part in content_type.split(';'):
-                if 'boundary=' in part:
-                    boundary = '--' + part.split('boundary=')[1].strip()
-                    break
+            boundary = get_boundary(content_type)
             
             if not boundary:
                 self.send_response(400)
                 self.send_header('Content-Type', 'application/json')
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
-                self.wfile.write(json.dumps({'error': 'No boundary found in Content-Type'}).encode())
+                self.wfile.write(dumps({'error': 'No boundary found in Content-Type'}))
                 return
             
-            # Read the body
+            # Stream and parse the body; file parts are read back once at the end
             try:
-                body = self.rfile.read(content_length)
-            except Exception as e:
-                self.send_response(500)
+                form_data = parse_multipart_stream(self.rfile, content_length, boundary)
+            except MultipartError as e:
+                self.send_response(400)
                 self.send_header('Content-Type', 'application/json')
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
-                self.wfile.write(json.dumps({'error': f'Failed to read request body: {str(e)}'}).encode())
+                self.wfile.write(dumps({'error': f'Failed to parse form data: {str(e)}'}))
                 return
-            
-            # Parse multipart data
-            try:
-                form_data = parse_multipart(body, boundary)
             except Exception as e:
-                self.send_response(400)
+                self.send_response(500)
                 self.send_header('Content-Type', 'application/json')
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
-                self.wfile.write(json.dumps({'error': f'Failed to parse form data: {str(e)}'}).encode())
+                self.wfile.write(dumps({'error': f'Failed to read request body: {str(e)}'}))
                 return
             
             # Get file
@@ -125,14 +104,26 @@ class handler(BaseHTTPRequestHandler):
                 self.send_header('Content-Type', 'application/json')
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
-                self.wfile.write(json.dumps({'error': 'Missing file field'}).encode())
+                self.wfile.write(dumps({'error': 'Missing file field'}))
                 return
             
             file_bytes = form_data['file']['content']
             
-            # Parse the PDF
+            # Get major_id if provided
+            major_id = None
+            if 'majorId' in form_data and not form_data['majorId']['is_file']:
+                major_id = form_data['majorId']['content']
+            
+            # Parse the PDF, reusing the result for a byte-identical re-upload
+            extraction = {'extractor': 'cache'}
+
+            def parse(pdf_bytes):
+                parsed, extraction['extractor'] = parse_pdf_detailed(pdf_bytes)
+                return parsed
+
             try:
-                parsed = parse_pdf(file_bytes)
+                parsed, cache_hit = parse_with_cache(file_bytes, parse, audit_cache,
+                                                     namespace=PARSER_VERSION)
             except Exception as e:
                 self.send_response(500)
                 self.send_header('Content-Type', 'application/json')
@@ -142,34 +133,14 @@ class handler(BaseHTTPRequestHandler):
                 # Provide more specific error messages
                 if 'pdf parsing library not available' in error_detail.lower():
                     error_detail = 'PDF parsing library not available on server. Please ensure requirements.txt includes pdfplumber and pdfminer.six.'
-                self.wfile.write(json.dumps({'error': f'Failed to parse PDF: {error_detail}'}).encode())
+                self.wfile.write(dumps({'error': f'Failed to parse PDF: {error_detail}'}))
                 return
             
-            # Get major_id if provided
-            major_id = None
-            if 'majorId' in form_data and not form_data['majorId']['is_file']:
-                major_id = form_data['majorId']['content']
-            
             remaining_summary = None
             
             if major_id:
                 try:
-                    mid = int(major_id)
-                    conn = get_db_connection()
-                    cursor = conn.cursor()
-                    
-                    # Required courses
-                    cursor.execute('SELECT course_code FROM major_requirements WHERE major_id = ?', (mid,))
-                    required_rows = cursor.fetchall()
-                    required_codes = {r['course_code'] for r in required_rows}
-                    
-                    # Elective courses
-                    cursor.execute('SELECT course_code FROM major_electives WHERE major_id = ?', (mid,))
-                    elective_rows = cursor.fetchall()
-                    elective_codes = {r['course_code'] for r in elective_rows}
-                    
-                    conn.close()
-                    remaining_summary = summarize(parsed, required_codes, elective_codes)
+                    remaining_summary = summarize(parsed, *load_requirement_codes(get_db_connection, major_id))
                 except Exception as e:
                     remaining_summary = {'error': f'Failed to compute remaining requirements: {str(e)}'}
             
@@ -182,8 +153,10 @@ class handler(BaseHTTPRequestHandler):
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('X-Audit-Cache', 'HIT' if cache_hit else 'MISS')
+            self.send_header('X-Audit-Extractor', extraction['extractor'])
             self.end_headers()
-            self.wfile.write(json.dumps(result).encode())
+            self.wfile.write(dumps(result))
             
         except Exception as e:
             self.send_response(500)
@@ -191,7 +164,7 @@ class handler(BaseHTTPRequestHandler):
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             error_msg = f'Server error: {str(e)}'
-            self.wfile.write(json.dumps({'error': error_msg}).encode())
+            self.wfile.write(dumps({'error': error_msg}))
     
     def do_OPTIONS(self):
         self.send_response(200)
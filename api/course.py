@@ -1,5 +1,4 @@
 from http.server import BaseHTTPRequestHandler
-import json
 import sys
 import os
 from urllib.parse import urlparse, parse_qs
@@ -7,8 +6,8 @@ from urllib.parse import urlparse, parse_qs
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(__file__))
 
-from _db import (get_db_connection, get_prerequisites_grouped,
-                 get_difficulty_from_grades, estimate_difficulty, parse_credits)
+from _fastjson import dumps
+from _catalog import get_catalog, parse_difficulty_model
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
@@ -22,63 +21,37 @@ class handler(BaseHTTPRequestHandler):
                 self.send_header('Content-type', 'application/json')
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
-                self.wfile.write(json.dumps({'error': 'Missing course code parameter'}).encode())
+                self.wfile.write(dumps({'error': 'Missing course code parameter'}))
                 return
 
-            course_code = params['code'][0].upper()
-
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                SELECT id, course_code, course_number, title, credits, credits_undergrad, credits_grad, description, level
-                FROM courses
-                WHERE course_code = ?
-            ''', (course_code,))
+            try:
+                model = parse_difficulty_model(params.get('difficultyModel', [None])[0])
+            except ValueError as e:
+                self.send_response(400)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(dumps({'error': str(e)}))
+                return
 
-            course = cursor.fetchone()
+            course = get_catalog().find(params['code'][0])
 
             if course is None:
-                conn.close()
                 self.send_response(404)
                 self.send_header('Content-type', 'application/json')
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
-                self.wfile.write(json.dumps({'error': 'Course not found'}).encode())
+                self.wfile.write(dumps({'error': 'Course not found'}))
                 return
 
-            prereq_data = get_prerequisites_grouped(course['id'])
-            difficulty = get_difficulty_from_grades(course['course_code'])
-            if difficulty is None:
-                difficulty = estimate_difficulty(course['level'])
-
-            credits_undergrad = course['credits_undergrad'] or parse_credits(course['credits'])
-            credits_grad = course['credits_grad'] or parse_credits(course['credits'])
-
-            result = {
-                'id': course['course_code'].lower().replace(' ', ''),
-                'code': course['course_code'],
-                'title': course['title'],
-                'credits': credits_undergrad,
-                'creditsUndergrad': credits_undergrad,
-                'creditsGrad': credits_grad,
-                'level': course['level'],
-                'difficulty': difficulty,
-                'description': course['description'],
-                'prerequisiteGroups': prereq_data['groups'],
-                'prerequisitesFormatted': prereq_data['formatted']
-            }
-
-            conn.close()
-
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
-            self.wfile.write(json.dumps(result).encode())
+            self.wfile.write(course.to_json(model=model))
         except Exception as e:
             self.send_response(500)
             self.send_header('Content-Type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
-            self.wfile.write(json.dumps({'error': str(e)}).encode())
+            self.wfile.write(dumps({'error': str(e)}))
@@ -0,0 +1,54 @@
+from http.server import BaseHTTPRequestHandler
+import sys
+import os
+import re
+from urllib.parse import unquote
+
+# Add parent directory to path to access _db module
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from _fastjson import dumps
+from _db import get_grades_connection
+from _course_codes import normalize_code
+from _grades import COURSE_INSTRUCTORS_QUERY, course_instructors_response
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        try:
+            # Path will be like /api/courses/CS%20141/instructors
+            match = re.search(r'/courses/([^/?]+)/instructors', self.path)
+
+            if not match:
+                self.send_response(400)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(dumps({'error': 'Invalid URL format'}))
+                return
+
+            course_code = normalize_code(unquote(match.group(1)))
+
+            # Per-instructor stats are materialized by the grade importer
+            conn = get_grades_connection()
+            rows = conn.execute(COURSE_INSTRUCTORS_QUERY, (course_code,)).fetchall()
+            conn.close()
+
+            if not rows:
+                self.send_response(404)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(dumps({'error': 'Course not found'}))
+                return
+
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(course_instructors_response(rows))
+        except Exception as e:
+            self.send_response(500)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(dumps({'error': str(e)}))
@@ -0,0 +1,66 @@
+from http.server import BaseHTTPRequestHandler
+import sys
+import os
+import re
+from urllib.parse import urlparse, parse_qs, unquote
+
+# Add parent directory to path to access _db module
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from _fastjson import dumps
+from _db import get_grades_connection
+from _grades import (DEPARTMENT_GRADES_QUERY, DEPARTMENT_EXISTS_QUERY,
+                     department_grade_params, department_grades_response)
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        try:
+            # Path will be like /api/departments/MATH/grades?level=300&from=Fall%202022&to=2024
+            parsed_path = urlparse(self.path)
+            match = re.search(r'/departments/([^/?]+)/grades', parsed_path.path)
+
+            if not match:
+                self.send_response(400)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(dumps({'error': 'Invalid URL format'}))
+                return
+
+            query = parse_qs(parsed_path.query)
+            level, first, last = (query.get(name, [None])[0] for name in ('level', 'from', 'to'))
+            try:
+                params = department_grade_params(unquote(match.group(1)), level, first, last)
+            except ValueError as e:
+                self.send_response(400)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(dumps({'error': str(e)}))
+                return
+
+            # Pooled from department_grade_rollups, built by the grade importer
+            conn = get_grades_connection()
+            rows = conn.execute(DEPARTMENT_GRADES_QUERY, params).fetchall()
+            known = rows or conn.execute(DEPARTMENT_EXISTS_QUERY, params[:1]).fetchone()
+            conn.close()
+
+            if not known:
+                self.send_response(404)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(dumps({'error': 'Department not found'}))
+                return
+
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(department_grades_response(params, rows, first, last))
+        except Exception as e:
+            self.send_response(500)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(dumps({'error': str(e)}))
@@ -0,0 +1,56 @@
+from http.server import BaseHTTPRequestHandler
+import sys
+import os
+from urllib.parse import urlparse, parse_qs
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _fastjson import dumps, loads
+from _catalog import get_catalog, serialize_courses, parse_difficulty_model
+from _eligibility import eligibility_delta
+from _course_codes import parse_code_list
+
+class handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        try:
+            # Read POST body: {"completed": [...], "added": [...], "removed": [...]}
+            content_length = int(self.headers['Content-Length'])
+            data = loads(self.rfile.read(content_length))
+
+            params = parse_qs(urlparse(self.path).query)
+            try:
+                model = parse_difficulty_model(params.get('difficultyModel', [None])[0])
+                codes = [parse_code_list(data.get(field, []), field) for field in ('completed', 'added', 'removed')]
+            except ValueError as e:
+                self.send_response(400)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(dumps({'error': str(e)}))
+                return
+
+            # Only courses depending on the changed codes are re-evaluated
+            entered, left, evaluated = eligibility_delta(get_catalog(), *codes)
+
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(b'{"entered":%b,"left":%b,"evaluated":%d}' % (
+                serialize_courses(entered, model), serialize_courses(left, model), evaluated))
+        except Exception as e:
+            self.send_response(500)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(dumps({'error': str(e)}))
+
+    def do_OPTIONS(self):
+        # Handle CORS preflight
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+        return
@@ -1,94 +1,78 @@
 from http.server import BaseHTTPRequestHandler
-import json
 import sys
 import os
+from urllib.parse import urlparse, parse_qs
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(__file__))
 
-from _db import (get_db_connection, get_prerequisites_grouped,
-                 get_difficulty_from_grades, estimate_difficulty, parse_credits)
+from _fastjson import dumps, loads, wants_ndjson, NDJSON_MIMETYPE
+from _catalog import get_catalog, serialize_courses, iter_ndjson, parse_difficulty_model
+from _eligibility import EligibilityCache
+from _course_codes import parse_code_list
+
+# Results for identical completed sets, reused while this instance stays warm
+eligibility_cache = EligibilityCache()
 
 class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        # Hit/miss counters of this instance's eligibility cache
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(dumps({'eligibilityCache': eligibility_cache.stats()}))
+
     def do_POST(self):
         try:
             # Read POST body
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
-
-            completed_codes = data.get('completed', [])
-
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            # Get all courses
-            cursor.execute('''
-                SELECT id, course_code, course_number, title, credits, credits_undergrad, credits_grad, description, level
-                FROM courses
-                ORDER BY course_number
-            ''')
-            courses = cursor.fetchall()
-
-            eligible = []
-
-            for course in courses:
-                # Skip if already completed
-                if course['course_code'] in completed_codes:
-                    continue
-
-                prereq_data = get_prerequisites_grouped(course['id'])
-
-                # Check if prerequisites are met
-                prereqs_met = True
-                if prereq_data['groups']:
-                    for group in prereq_data['groups']:
-                        group_met = any(prereq in completed_codes for prereq in group)
-                        if not group_met:
-                            prereqs_met = False
-                            break
-
-                if prereqs_met:
-                    difficulty = get_difficulty_from_grades(course['course_code'])
-                    if difficulty is None:
-                        difficulty = estimate_difficulty(course['level'])
-
-                    credits_undergrad = course['credits_undergrad'] or parse_credits(course['credits'])
-                    credits_grad = course['credits_grad'] or parse_credits(course['credits'])
-
-                    eligible.append({
-                        'id': course['course_code'].lower().replace(' ', ''),
-                        'code': course['course_code'],
-                        'title': course['title'],
-                        'credits': credits_undergrad,
-                        'creditsUndergrad': credits_undergrad,
-                        'creditsGrad': credits_grad,
-                        'level': course['level'],
-                        'difficulty': difficulty,
-                        'description': course['description'],
-                        'prerequisiteGroups': prereq_data['groups'],
-                        'prerequisitesFormatted': prereq_data['formatted']
-                    })
-
-            conn.close()
+            data = loads(post_data)
+
+            params = parse_qs(urlparse(self.path).query)
+            try:
+                model = parse_difficulty_model(params.get('difficultyModel', [None])[0])
+                completed = parse_code_list(data.get('completed', []), 'completed')
+            except ValueError as e:
+                self.send_response(400)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(dumps({'error': str(e)}))
+                return
+
+            eligible, cache_hit = eligibility_cache.eligible(get_catalog(), completed)
+
+            # Streaming mode: one eligible course per line
+            if wants_ndjson(self.headers.get('Accept'), params.get('stream', [None])[0]):
+                self.send_response(200)
+                self.send_header('Content-Type', NDJSON_MIMETYPE)
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('X-Eligibility-Cache', 'HIT' if cache_hit else 'MISS')
+                self.end_headers()
+                for line in iter_ndjson(eligible, model):
+                    self.wfile.write(line)
+                return
 
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('X-Eligibility-Cache', 'HIT' if cache_hit else 'MISS')
             self.end_headers()
-            self.wfile.write(json.dumps(eligible).encode())
+            self.wfile.write(serialize_courses(eligible, model))
         except Exception as e:
             self.send_response(500)
             self.send_header('Content-Type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
-            self.wfile.write(json.dumps({'error': str(e)}).encode())
+            self.wfile.write(dumps({'error': str(e)}))
 
     def do_OPTIONS(self):
         # Handle CORS preflight
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Accept')
         self.end_headers()
         return
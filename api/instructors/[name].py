@@ -0,0 +1,53 @@
+from http.server import BaseHTTPRequestHandler
+import sys
+import os
+import re
+from urllib.parse import unquote
+
+# Add parent directory to path to access _db module
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from _fastjson import dumps
+from _db import get_grades_connection
+from _grades import INSTRUCTOR_COURSES_QUERY, instructor_response
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        try:
+            # Path will be like /api/instructors/Smith%2C%20John (names match case-insensitively)
+            match = re.search(r'/instructors/([^/?]+)', self.path)
+
+            if not match:
+                self.send_response(400)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(dumps({'error': 'Invalid URL format'}))
+                return
+
+            name = unquote(match.group(1)).strip()
+
+            # Per-course stats are materialized by the grade importer
+            conn = get_grades_connection()
+            rows = conn.execute(INSTRUCTOR_COURSES_QUERY, (name,)).fetchall()
+            conn.close()
+
+            if not rows:
+                self.send_response(404)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(dumps({'error': 'Instructor not found'}))
+                return
+
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(instructor_response(rows))
+        except Exception as e:
+            self.send_response(500)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(dumps({'error': str(e)}))
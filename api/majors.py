@@ -1,12 +1,12 @@
 from http.server import BaseHTTPRequestHandler
-import json
 import sys
 import os
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(__file__))
 
-from _db import get_db_connection
+from _fastjson import dumps
+from _db import get_db_connection, MAJORS_QUERY
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
@@ -14,11 +14,7 @@ class handler(BaseHTTPRequestHandler):
             conn = get_db_connection()
             cursor = conn.cursor()
 
-            cursor.execute('''
-                SELECT id, name, concentration
-                FROM majors
-                ORDER BY name, concentration
-            ''')
+            cursor.execute(MAJORS_QUERY)
 
             majors = cursor.fetchall()
             result = []
@@ -36,9 +32,9 @@ class handler(BaseHTTPRequestHandler):
             self.send_header('Content-Type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
-            self.wfile.write(json.dumps(result).encode())
+            self.wfile.write(dumps(result))
         except Exception as e:
             self.send_response(500)
             self.send_header('Content-Type', 'application/json')
             self.end_headers()
-            self.wfile.write(json.dumps({'error': str(e)}).encode())
+            self.wfile.write(dumps({'error': str(e)}))
@@ -1,5 +1,4 @@
 from http.server import BaseHTTPRequestHandler
-import json
 import sys
 import os
 import re
@@ -7,8 +6,9 @@ import re
 # Add parent directory to path to access _db module
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
-from _db import (get_db_connection, get_prerequisites_grouped,
-                 get_difficulty_from_grades, estimate_difficulty, parse_credits)
+from _fastjson import dumps
+from _db import get_db_connection, MAJOR_QUERY, MAJOR_REQUIREMENTS_QUERY, MAJOR_ELECTIVES_QUERY
+from _catalog import get_catalog
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
@@ -22,7 +22,7 @@ class handler(BaseHTTPRequestHandler):
                 self.send_header('Content-type', 'application/json')
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
-                self.wfile.write(json.dumps({'error': 'Invalid URL format'}).encode())
+                self.wfile.write(dumps({'error': 'Invalid URL format'}))
                 return
 
             major_id = int(match.group(1))
@@ -31,7 +31,7 @@ class handler(BaseHTTPRequestHandler):
             cursor = conn.cursor()
 
             # Get major info
-            cursor.execute('SELECT name, concentration FROM majors WHERE id = ?', (major_id,))
+            cursor.execute(MAJOR_QUERY, (major_id,))
             major = cursor.fetchone()
 
             if not major:
@@ -40,117 +40,50 @@ class handler(BaseHTTPRequestHandler):
                 self.send_header('Content-type', 'application/json')
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
-                self.wfile.write(json.dumps({'error': 'Major not found'}).encode())
+                self.wfile.write(dumps({'error': 'Major not found'}))
                 return
 
             # Get required course codes
-            cursor.execute('''
-                SELECT course_code, requirement_type
-                FROM major_requirements
-                WHERE major_id = ?
-                ORDER BY requirement_type, course_code
-            ''', (major_id,))
+            cursor.execute(MAJOR_REQUIREMENTS_QUERY, (major_id,))
 
             requirements = cursor.fetchall()
 
             # Get elective course codes
-            cursor.execute('''
-                SELECT course_code, elective_type
-                FROM major_electives
-                WHERE major_id = ?
-                ORDER BY elective_type, course_code
-            ''', (major_id,))
+            cursor.execute(MAJOR_ELECTIVES_QUERY, (major_id,))
 
             electives_data = cursor.fetchall()
 
-            # Get full course details for each requirement
-            required_courses = []
-            for req in requirements:
-                cursor.execute('''
-                    SELECT id, course_code, course_number, title, credits, credits_undergrad, credits_grad, description, level, difficulty
-                    FROM courses
-                    WHERE course_code = ?
-                ''', (req['course_code'],))
-
-                course = cursor.fetchone()
-                if course:
-                    prereq_data = get_prerequisites_grouped(course['id'])
-                    difficulty = get_difficulty_from_grades(course['course_code'])
-                    if difficulty is None:
-                        difficulty = course['difficulty'] or estimate_difficulty(course['level'])
-
-                    credits_undergrad = course['credits_undergrad'] or parse_credits(course['credits'])
-                    credits_grad = course['credits_grad'] or parse_credits(course['credits'])
-
-                    required_courses.append({
-                        'id': course['course_code'].lower().replace(' ', ''),
-                        'code': course['course_code'],
-                        'title': course['title'],
-                        'credits': credits_undergrad,
-                        'creditsUndergrad': credits_undergrad,
-                        'creditsGrad': credits_grad,
-                        'level': course['level'],
-                        'difficulty': difficulty,
-                        'description': course['description'],
-                        'prerequisiteGroups': prereq_data['groups'],
-                        'prerequisitesFormatted': prereq_data['formatted'],
-                        'requirementType': req['requirement_type']
-                    })
-
-            # Get full course details for each elective
-            elective_courses = []
-            for elective in electives_data:
-                cursor.execute('''
-                    SELECT id, course_code, course_number, title, credits, credits_undergrad, credits_grad, description, level, difficulty
-                    FROM courses
-                    WHERE course_code = ?
-                ''', (elective['course_code'],))
-
-                course = cursor.fetchone()
-                if course:
-                    prereq_data = get_prerequisites_grouped(course['id'])
-                    difficulty = get_difficulty_from_grades(course['course_code'])
-                    if difficulty is None:
-                        difficulty = course['difficulty'] or estimate_difficulty(course['level'])
-
-                    credits_undergrad = course['credits_undergrad'] or parse_credits(course['credits'])
-                    credits_grad = course['credits_grad'] or parse_credits(course['credits'])
-
-                    elective_courses.append({
-                        'id': course['course_code'].lower().replace(' ', ''),
-                        'code': course['course_code'],
-                        'title': course['title'],
-                        'credits': credits_undergrad,
-                        'creditsUndergrad': credits_undergrad,
-                        'creditsGrad': credits_grad,
-                        'level': course['level'],
-                        'difficulty': difficulty,
-                        'description': course['description'],
-                        'prerequisiteGroups': prereq_data['groups'],
-                        'prerequisitesFormatted': prereq_data['formatted'],
-                        'electiveType': elective['elective_type']
-                    })
-
-            result = {
-                'major': {
+            conn.close()
+
+            # Serialize the prebuilt course records with their requirement type
+            by_id = get_catalog().by_id
+            required_courses = [
+                by_id[req['course_id']].to_json([('requirementType', req['requirement_type'])])
+                for req in requirements if req['course_id'] in by_id
+            ]
+            elective_courses = [
+                by_id[elective['course_id']].to_json([('electiveType', elective['elective_type'])])
+                for elective in electives_data if elective['course_id'] in by_id
+            ]
+
+            body = b'{"major":%b,"requiredCourses":[%b],"electiveCourses":[%b]}' % (
+                dumps({
                     'id': major_id,
                     'name': major['name'],
                     'concentration': major['concentration']
-                },
-                'requiredCourses': required_courses,
-                'electiveCourses': elective_courses
-            }
-
-            conn.close()
+                }),
+                b','.join(required_courses),
+                b','.join(elective_courses)
+            )
 
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
-            self.wfile.write(json.dumps(result).encode())
+            self.wfile.write(body)
         except Exception as e:
             self.send_response(500)
             self.send_header('Content-Type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
-            self.wfile.write(json.dumps({'error': str(e)}).encode())
+            self.wfile.write(dumps({'error': str(e)}))
@@ -0,0 +1,58 @@
+from http.server import BaseHTTPRequestHandler
+import sys
+import os
+
+# Add parent directory to path to access _db module
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from _fastjson import dumps, loads
+from _catalog import get_catalog
+from _eligibility import EligibilityCache
+from _plan import simulate_plan
+from _course_codes import parse_code_list
+
+# Eligibility of the starting completed set, reused while this instance stays warm
+eligibility_cache = EligibilityCache()
+
+class handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        try:
+            # Read POST body: {"completed": [...], "inProgress": [...],
+            #                  "terms": [{"term": "Fall 2025", "courses": [...]}, ...]}
+            content_length = int(self.headers['Content-Length'])
+            data = loads(self.rfile.read(content_length))
+
+            catalog = get_catalog()
+            try:
+                completed = parse_code_list(data.get('completed', []), 'completed')
+                in_progress = parse_code_list(data.get('inProgress', []), 'inProgress')
+                base_eligible, _ = eligibility_cache.eligible(catalog, completed)
+                terms = simulate_plan(catalog, completed, in_progress, data.get('terms', []), base_eligible)
+            except ValueError as e:
+                self.send_response(400)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(dumps({'error': str(e)}))
+                return
+
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(dumps({'terms': terms}))
+        except Exception as e:
+            self.send_response(500)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(dumps({'error': str(e)}))
+
+    def do_OPTIONS(self):
+        # Handle CORS preflight
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+        return
@@ -1,81 +1,168 @@
 # -*- coding: utf-8 -*-
+"""
+Index manager for the course database.
+
+INDEXES declares every index the API's hot queries rely on: the catalog,
+prerequisite and grade-array loads, the majors and requirement listings, and
+the single-row reads of the precomputed grade tables. The grade endpoints no
+longer touch grade_distributions; its indexes serve the grade-array load and
+build_grade_rollups.py. Applying them is
+idempotent: missing indexes are created, indexes superseded by a composite are
+dropped, and ANALYZE refreshes the planner statistics. The plan check then
+runs EXPLAIN QUERY PLAN on each hot query and fails if any of them scans a
+table without an index, builds an automatic index or sorts in a temp B-tree.
+
+Usage:
+    python add_indexes.py [path/to/uic_courses.db]          apply, ANALYZE, check
+    python add_indexes.py --check [path/to/uic_courses.db]  check only
+
+Both exit with status 1 when a query plan regresses, so deploy.sh stops.
+"""
 import sqlite3
 import os
+import sys
+
+from migrate_course_ids import COURSE_ID_INDEXES, add_course_id_columns, backfill_course_ids
+
+# Queries are checked as-is from the ../api modules that run them
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+from _db import (PREREQUISITES_QUERY, MAJORS_QUERY, MAJOR_QUERY, MAJOR_REQUIREMENTS_QUERY,
+                 MAJOR_ELECTIVES_QUERY)
+from _catalog import COURSES_QUERY
+from _grade_arrays import GRADE_ROWS_QUERY
+from _grades import (ROLLUP_QUERY, COURSE_INSTRUCTORS_QUERY, INSTRUCTOR_COURSES_QUERY,
+                     DEPARTMENT_GRADES_QUERY)
+from _audit_parser.jobs import REQUIRED_CODES_QUERY, ELECTIVE_CODES_QUERY
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATABASE = os.path.join(BASE_DIR, 'uic_courses.db')
 
-def add_indexes():
-    """Add indexes to improve query performance"""
-    conn = sqlite3.connect(DATABASE)
+# name -> table(columns)
+INDEXES = {
+    # Catalog load: ORDER BY course_number
+    'idx_courses_number': 'courses(course_number)',
+    # Prerequisite index: ORDER BY course_id, group_id, prerequisite_code without a sort
+    'idx_prerequisites_course_group': 'prerequisites(course_id, group_id, prerequisite_code)',
+    # Reverse lookups (which courses require X)
+    'idx_prerequisites_code': 'prerequisites(prerequisite_code)',
+    # Major requirement listings, plus the course_id column index from the migration
+    # (see migrate_course_ids.py)
+    **COURSE_ID_INDEXES,
+    # Sections course by course: the grade-array load (GRADE_ROWS_QUERY) and the
+    # rollup builds in build_grade_rollups.py
+    'idx_grade_distributions_course_semester': 'grade_distributions(course_id, semester_id, instructor)',
+    'idx_grade_distributions_semester_id': 'grade_distributions(semester_id)',
+    # Semesters newest first for the importer's summary; unique so a join driven
+    # by it keeps that order
+    'idx_semesters_year_term': 'semesters(year DESC, term)',
+}
+UNIQUE_INDEXES = {'idx_semesters_year_term'}
+
+# Single-column indexes covered by a composite or UNIQUE index above
+OBSOLETE_INDEXES = (
+    'idx_courses_code',                     # UNIQUE(course_code)
+    'idx_prerequisites_course_id',          # idx_prerequisites_course_group
+    'idx_grade_distributions_course_code',  # UNIQUE(course_code, semester_id, instructor)
+    'idx_major_requirements_major_id',      # idx_major_requirements_major_course_id
+    'idx_major_electives_major_id',         # idx_major_electives_major_course_id
+)
+
+# (where the query is defined and who runs it, SQL, sample parameters).
+# Every query is imported from the module that executes it, so the check
+# always sees the SQL the API actually runs.
+HOT_QUERIES = (
+    ('_db.PREREQUISITES_QUERY (get_prerequisite_index)', PREREQUISITES_QUERY, ()),
+    ('_catalog.COURSES_QUERY (get_catalog)', COURSES_QUERY, ()),
+    ('_grade_arrays.GRADE_ROWS_QUERY (catalog difficulty, GradeArrays.from_database)', GRADE_ROWS_QUERY, ()),
+    ('_db.MAJORS_QUERY (majors endpoints)', MAJORS_QUERY, ()),
+    ('_db.MAJOR_QUERY (requirements endpoints)', MAJOR_QUERY, (1,)),
+    ('_db.MAJOR_REQUIREMENTS_QUERY (requirements endpoints)', MAJOR_REQUIREMENTS_QUERY, (1,)),
+    ('_db.MAJOR_ELECTIVES_QUERY (requirements endpoints)', MAJOR_ELECTIVES_QUERY, (1,)),
+    ('_audit_parser.jobs.REQUIRED_CODES_QUERY (load_requirement_codes)', REQUIRED_CODES_QUERY, (1,)),
+    ('_audit_parser.jobs.ELECTIVE_CODES_QUERY (load_requirement_codes)', ELECTIVE_CODES_QUERY, (1,)),
+    ('_grades.ROLLUP_QUERY (course grades endpoints)', ROLLUP_QUERY, ('CS 141',)),
+    ('_grades.COURSE_INSTRUCTORS_QUERY (course instructors endpoints)', COURSE_INSTRUCTORS_QUERY, ('CS 141',)),
+    ('_grades.INSTRUCTOR_COURSES_QUERY (instructor endpoints)', INSTRUCTOR_COURSES_QUERY, ('Smith, John',)),
+    ('_grades.DEPARTMENT_GRADES_QUERY (department grades endpoints)', DEPARTMENT_GRADES_QUERY,
+     ('MATH', 300, 300, 20221, 20243)),
+)
+
+def apply_indexes(conn):
+    """Create the declared indexes, drop superseded ones and refresh statistics."""
     cursor = conn.cursor()
 
-    print("Adding database indexes...")
-
-    # Index for course lookups by code
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_courses_code
-        ON courses(course_code)
-    ''')
-    print("Created index on courses.course_code")
-
-    # Index for prerequisite lookups
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_prerequisites_course_id
-        ON prerequisites(course_id)
-    ''')
-    print("Created index on prerequisites.course_id")
-
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_prerequisites_code
-        ON prerequisites(prerequisite_code)
-    ''')
-    print("Created index on prerequisites.prerequisite_code")
-
-    # Index for grade distribution lookups
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_grade_distributions_course_code
-        ON grade_distributions(course_code)
-    ''')
-    print("Created index on grade_distributions.course_code")
-
-    # Index for semester lookups
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_grade_distributions_semester_id
-        ON grade_distributions(semester_id)
-    ''')
-    print("Created index on grade_distributions.semester_id")
-
-    # Index for major requirements
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_major_requirements_major_id
-        ON major_requirements(major_id)
-    ''')
-    print("Created index on major_requirements.major_id")
-
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_major_requirements_course_code
-        ON major_requirements(course_code)
-    ''')
-    print("Created index on major_requirements.course_code")
-
-    # Index for major electives
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_major_electives_major_id
-        ON major_electives(major_id)
-    ''')
-    print("Created index on major_electives.major_id")
-
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_major_electives_course_code
-        ON major_electives(course_code)
-    ''')
-    print("Created index on major_electives.course_code")
+    # The course_id indexes need the migrated columns; no-op once migrated
+    add_course_id_columns(cursor)
+    backfill_course_ids(cursor)
 
+    for name in OBSOLETE_INDEXES:
+        cursor.execute(f'DROP INDEX IF EXISTS {name}')
+
+    for name, definition in INDEXES.items():
+        unique = 'UNIQUE ' if name in UNIQUE_INDEXES else ''
+        cursor.execute(f'CREATE {unique}INDEX IF NOT EXISTS {name} ON {definition}')
+        print(f"Index {name} on {definition}")
+
+    cursor.execute('ANALYZE')
     conn.commit()
+    print("ANALYZE complete")
+
+def plan_problems(plan):
+    """Reasons a query plan is not acceptable (empty if it is)."""
+    problems = []
+    for detail in plan:
+        if 'TEMP B-TREE' in detail:
+            problems.append(detail)
+        elif 'AUTOMATIC' in detail:
+            problems.append(detail)
+        elif detail.startswith('SCAN') and 'INDEX' not in detail:
+            problems.append(detail)
+    return problems
+
+def check_query_plans(conn):
+    """
+    EXPLAIN QUERY PLAN every hot query.
+    Returns {query label: [problems]} for the queries that regressed.
+    """
+    failures = {}
+    for label, sql, params in HOT_QUERIES:
+        try:
+            plan = [row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql, params)]
+        except sqlite3.OperationalError as e:
+            failures[label] = [f"query failed: {e}"]
+            continue
+        problems = plan_problems(plan)
+        if problems:
+            failures[label] = problems
+        else:
+            print(f"  ok  {label}: {'; '.join(plan)}")
+    return failures
+
+def add_indexes(database=DATABASE, check_only=False):
+    """Apply the index set (unless check_only) and check the hot query plans. Returns True if all pass."""
+    conn = sqlite3.connect(database)
+
+    if not check_only:
+        print(f"Applying indexes to {database}...")
+        apply_indexes(conn)
+
+    print(f"\nChecking query plans in {database}...")
+    failures = check_query_plans(conn)
     conn.close()
 
-    print("\nAll indexes created successfully!")
+    if failures:
+        print("\nQuery plan regressions:")
+        for label, problems in failures.items():
+            for problem in problems:
+                print(f"  FAIL {label}: {problem}")
+        return False
+
+    print(f"\nAll {len(HOT_QUERIES)} hot queries use indexes without temp B-trees")
+    return True
 
 if __name__ == '__main__':
-    add_indexes()
+    args = sys.argv[1:]
+    check_only = '--check' in args
+    paths = [arg for arg in args if arg != '--check']
+    ok = add_indexes(paths[0] if paths else DATABASE, check_only=check_only)
+    sys.exit(0 if ok else 1)
@@ -5,6 +5,14 @@ if they don't already exist.
 """
 
 import sqlite3
+import os
+import sys
+
+# Course code normalization is shared with the API in ../api
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+from _course_codes import split_code
+from migrate_course_ids import add_course_id_columns, backfill_course_ids
+from build_grade_rollups import rebuild as rebuild_grade_rollups
 
 def add_missing_courses_from_grades():
     """
@@ -23,11 +31,16 @@ def add_missing_courses_from_grades():
     initial_count = cursor.fetchone()[0]
     print(f"\nInitial courses in database: {initial_count}")
 
+    # Link rows whose course exists under another spelling first, so only
+    # codes with no course at all are added
+    add_course_id_columns(cursor)
+    backfill_course_ids(cursor)
+
     # Find courses in grade_distributions but not in courses
     cursor.execute('''
         SELECT DISTINCT gd.course_code
         FROM grade_distributions gd
-        WHERE gd.course_code NOT IN (SELECT course_code FROM courses)
+        WHERE gd.course_id IS NULL
         ORDER BY gd.course_code
     ''')
 
@@ -36,6 +49,8 @@ def add_missing_courses_from_grades():
 
     if len(missing_courses) == 0:
         print("\n✓ All courses from grade distributions already exist!")
+        conn.commit()
+        rebuild_grade_rollups(conn)
         conn.close()
         return
 
@@ -51,10 +66,9 @@ def add_missing_courses_from_grades():
     added_count = 0
     for (course_code,) in missing_courses:
         # Parse course code to get subject and number
-        parts = course_code.split()
-        if len(parts) >= 2:
-            subject = parts[0]
-            number = parts[1]
+        parts = split_code(course_code)
+        if parts:
+            subject, number = parts
 
             # Create a basic course title from the course code
             # We'll use placeholder data since we don't have full course info
@@ -94,7 +108,10 @@ def add_missing_courses_from_grades():
                 print(f"  ✗ Failed to add {course_code}: {e}")
                 continue
 
+    # Point the grade rows at their newly added courses
+    backfill_course_ids(cursor)
     conn.commit()
+    rebuild_grade_rollups(conn)
 
     # Get final count
     cursor.execute('SELECT COUNT(DISTINCT course_code) FROM courses')
@@ -1,20 +1,51 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-from flask_caching import Cache
 import sqlite3
 import os
-from audit_parser import parse_pdf, summarize  # new import for audit parsing
+import sys
+import threading
+from fastjson import FastJSONProvider
+from response_cache import ResponseCache
+
+# The course catalog and audit parsing are shared with the Vercel handlers in ../api
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+from _db import (use_database, get_catalog_version, check_course_id_columns, check_rollup_tables,
+                 MAJORS_QUERY, MAJOR_QUERY, MAJOR_REQUIREMENTS_QUERY, MAJOR_ELECTIVES_QUERY)
+from _fastjson import dumps, wants_ndjson, NDJSON_MIMETYPE
+from _catalog import get_catalog, serialize_courses, iter_ndjson, parse_difficulty_model
+from _audit_parser import (parse_pdf_detailed, summarize, PARSER_VERSION,
+                           AuditResultCache, parse_with_cache)
+from _audit_parser.jobs import AuditJobQueue, requirement_sets, load_requirement_codes
+from _course_codes import normalize_code, parse_code_list
+from _eligibility import EligibilityCache, eligibility_delta
+from _plan import simulate_plan
+from _grades import (ROLLUP_QUERY, grade_response, COURSE_INSTRUCTORS_QUERY,
+                     course_instructors_response, INSTRUCTOR_COURSES_QUERY, instructor_response,
+                     DEPARTMENT_GRADES_QUERY, DEPARTMENT_EXISTS_QUERY,
+                     department_grade_params, department_grades_response)
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)  # orjson when installed, stdlib otherwise
 CORS(app, resources={r"/api/*": {"origins": "*"}})  # Allow all origins for development
 
-# Configure caching
-cache_config = {
-    'CACHE_TYPE': 'SimpleCache',  # In-memory cache
-    'CACHE_DEFAULT_TIMEOUT': 300  # 5 minutes default
-}
-app.config.from_mapping(cache_config)
-cache = Cache(app)
+# Read-route responses, keyed by catalog version so a rebuilt database is
+# served immediately (store picked by RESPONSE_CACHE, see response_cache.py)
+response_cache = ResponseCache(get_catalog_version)
+# Eligible courses per canonical completed set, shared by every spelling and order
+eligibility_cache = EligibilityCache()
+
+# Parsed results of recent audit uploads, keyed by file content
+audit_cache = AuditResultCache()
+# Async audit uploads are parsed by this process's worker pool (AUDIT_JOB_WORKERS);
+# the queue file is opened on the first async upload or poll
+_audit_jobs = {'queue': None}
+_audit_jobs_lock = threading.Lock()
+
+def get_audit_jobs():
+    with _audit_jobs_lock:
+        if _audit_jobs['queue'] is None:
+            _audit_jobs['queue'] = AuditJobQueue(cache=audit_cache)
+        return _audit_jobs['queue']
 
 @app.get("/")
 def home():
@@ -29,23 +60,38 @@ if not os.path.exists(DATABASE):
     print("Please run generic_course_scraper.py and generic_major_scraper.py first to create the database.")
     exit(1)
 
+# The shared catalog reads this copy of the database
+use_database(DATABASE)
+
+# Catalog, grade and requirement queries join on the integer course_id columns;
+# the grade endpoints read the tables built by build_grade_rollups.py
+conn = sqlite3.connect(DATABASE)
+try:
+    check_course_id_columns(conn)
+    check_rollup_tables(conn)
+except RuntimeError as e:
+    print(f"ERROR: {e}")
+    exit(1)
+finally:
+    conn.close()
+
 def get_db_connection():
     conn = sqlite3.connect(DATABASE)
     conn.row_factory = sqlite3.Row
     return conn
 
+def streaming_requested():
+    """True when the client asked for newline-delimited JSON (Accept header or ?stream=1)."""
+    return wants_ndjson(request.headers.get('Accept'), request.args.get('stream'))
+
 # Get all majors
 @app.route('/api/majors', methods=['GET'])
-@cache.cached(timeout=600)  # Cache for 10 minutes
+@response_cache.cached()
 def get_majors():
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    cursor.execute('''
-        SELECT id, name, concentration
-        FROM majors
-        ORDER BY name, concentration
-    ''')
+    cursor.execute(MAJORS_QUERY)
     
     majors = cursor.fetchall()
     result = []
@@ -62,12 +108,13 @@ def get_majors():
 
 # Get required courses for a major
 @app.route('/api/majors/<int:major_id>/requirements', methods=['GET'])
+@response_cache.cached()
 def get_major_requirements(major_id):
     conn = get_db_connection()
     cursor = conn.cursor()
     
     # Get major info
-    cursor.execute('SELECT name, concentration FROM majors WHERE id = ?', (major_id,))
+    cursor.execute(MAJOR_QUERY, (major_id,))
     major = cursor.fetchone()
     
     if not major:
@@ -75,111 +122,38 @@ def get_major_requirements(major_id):
         return jsonify({'error': 'Major not found'}), 404
     
     # Get required course codes
-    cursor.execute('''
-        SELECT course_code, requirement_type
-        FROM major_requirements
-        WHERE major_id = ?
-        ORDER BY requirement_type, course_code
-    ''', (major_id,))
+    cursor.execute(MAJOR_REQUIREMENTS_QUERY, (major_id,))
 
     requirements = cursor.fetchall()
 
     # Get elective course codes
-    cursor.execute('''
-        SELECT course_code, elective_type
-        FROM major_electives
-        WHERE major_id = ?
-        ORDER BY elective_type, course_code
-    ''', (major_id,))
+    cursor.execute(MAJOR_ELECTIVES_QUERY, (major_id,))
 
     electives_data = cursor.fetchall()
 
-    # Get full course details for each requirement
-    required_courses = []
-    for req in requirements:
-        cursor.execute('''
-            SELECT id, course_code, course_number, title, credits, credits_undergrad, credits_grad, description, level, difficulty
-            FROM courses
-            WHERE course_code = ?
-        ''', (req['course_code'],))
-        
-        course = cursor.fetchone()
-        if course:
-            # Get prerequisites with groups
-            prereq_data = get_prerequisites_grouped(course['id'])
-
-            # Determine difficulty: use grade data if available, otherwise use level-based estimate
-            difficulty = get_difficulty_from_grades(course['course_code'])
-            if difficulty is None:
-                difficulty = course['difficulty'] or estimate_difficulty(course['level'])
-
-            credits_undergrad = course['credits_undergrad'] or parse_credits(course['credits'])
-            credits_grad = course['credits_grad'] or parse_credits(course['credits'])
-
-            required_courses.append({
-                'id': course['course_code'].lower().replace(' ', ''),
-                'code': course['course_code'],
-                'title': course['title'],
-                'credits': credits_undergrad,  # Default to undergrad for backwards compatibility
-                'creditsUndergrad': credits_undergrad,
-                'creditsGrad': credits_grad,
-                'level': course['level'],
-                'difficulty': difficulty,
-                'description': course['description'],
-                'prerequisiteGroups': prereq_data['groups'],
-                'prerequisitesFormatted': prereq_data['formatted'],
-                'requirementType': req['requirement_type']
-            })
-
-    # Get full course details for each elective
-    elective_courses = []
-    for elective in electives_data:
-        cursor.execute('''
-            SELECT id, course_code, course_number, title, credits, credits_undergrad, credits_grad, description, level, difficulty
-            FROM courses
-            WHERE course_code = ?
-        ''', (elective['course_code'],))
-
-        course = cursor.fetchone()
-        if course:
-            # Get prerequisites with groups
-            prereq_data = get_prerequisites_grouped(course['id'])
-
-            # Determine difficulty: use grade data if available, otherwise use level-based estimate
-            difficulty = get_difficulty_from_grades(course['course_code'])
-            if difficulty is None:
-                difficulty = course['difficulty'] or estimate_difficulty(course['level'])
-
-            credits_undergrad = course['credits_undergrad'] or parse_credits(course['credits'])
-            credits_grad = course['credits_grad'] or parse_credits(course['credits'])
-
-            elective_courses.append({
-                'id': course['course_code'].lower().replace(' ', ''),
-                'code': course['course_code'],
-                'title': course['title'],
-                'credits': credits_undergrad,  # Default to undergrad for backwards compatibility
-                'creditsUndergrad': credits_undergrad,
-                'creditsGrad': credits_grad,
-                'level': course['level'],
-                'difficulty': difficulty,
-                'description': course['description'],
-                'prerequisiteGroups': prereq_data['groups'],
-                'prerequisitesFormatted': prereq_data['formatted'],
-                'electiveType': elective['elective_type']
-            })
-
-    result = {
-        'major': {
+    conn.close()
+
+    # Serialize the prebuilt course records with their requirement type
+    by_id = get_catalog().by_id
+    required_courses = [
+        by_id[req['course_id']].to_json([('requirementType', req['requirement_type'])])
+        for req in requirements if req['course_id'] in by_id
+    ]
+    elective_courses = [
+        by_id[elective['course_id']].to_json([('electiveType', elective['elective_type'])])
+        for elective in electives_data if elective['course_id'] in by_id
+    ]
+
+    body = b'{"major":%b,"requiredCourses":[%b],"electiveCourses":[%b]}' % (
+        dumps({
             'id': major_id,
             'name': major['name'],
             'concentration': major['concentration']
-        },
-        'requiredCourses': required_courses,
-        'electiveCourses': elective_courses
-    }
-
-    conn.close()
-    return jsonify(result)
+        }),
+        b','.join(required_courses),
+        b','.join(elective_courses)
+    )
+    return Response(body, mimetype='application/json')
 
 # --- Audit Upload & Parsing Endpoint ---
 @app.route('/api/audit/upload', methods=['POST'])
@@ -190,6 +164,8 @@ def upload_audit():
       - file: PDF audit
       - majorId (optional): to compute remaining requirements
     Returns JSON with detected course sets and (if majorId provided) remaining courses.
+    With ?async=1 the parse is queued instead and a 202 with a job id is
+    returned; poll /api/audit/jobs/<id> for the same result.
     """
     if 'file' not in request.files:
         return jsonify({'error': 'Missing file field'}), 400
@@ -198,533 +174,215 @@ def upload_audit():
         return jsonify({'error': 'File must be a PDF'}), 400
 
     file_bytes = pdf_file.read()
+    major_id = request.form.get('majorId') or request.args.get('majorId')
+
+    # Async mode: queue the parse and return a job id to poll
+    if request.args.get('async', '').lower() in ('1', 'true'):
+        requirements = None
+        if major_id:
+            try:
+                requirements = requirement_sets(*load_requirement_codes(get_db_connection, major_id))
+            except Exception as e:
+                requirements = {'error': f'Failed to compute remaining requirements: {e}'}
+        job_id = get_audit_jobs().submit(file_bytes, requirements)
+        status_url = f'/api/audit/jobs/{job_id}'
+        response = jsonify({'jobId': job_id, 'status': 'queued', 'statusUrl': status_url})
+        response.headers['Location'] = status_url
+        return response, 202
+
+    extraction = {'extractor': 'cache'}
+
+    def parse(pdf_bytes):
+        parsed, extraction['extractor'] = parse_pdf_detailed(pdf_bytes)
+        return parsed
+
     try:
-        parsed = parse_pdf(file_bytes)
+        parsed, cache_hit = parse_with_cache(file_bytes, parse, audit_cache, namespace=PARSER_VERSION)
     except Exception as e:
         return jsonify({'error': f'Failed to parse PDF: {e}'}), 500
 
-    major_id = request.form.get('majorId') or request.args.get('majorId')
     remaining_summary = None
     if major_id:
         try:
-            mid = int(major_id)
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            # Required
-            cursor.execute('SELECT course_code FROM major_requirements WHERE major_id = ?', (mid,))
-            required_rows = cursor.fetchall()
-            required_codes = {r['course_code'] for r in required_rows}
-            # Electives
-            cursor.execute('SELECT course_code FROM major_electives WHERE major_id = ?', (mid,))
-            elective_rows = cursor.fetchall()
-            elective_codes = {r['course_code'] for r in elective_rows}
-            conn.close()
-            remaining_summary = summarize(parsed, required_codes, elective_codes)
+            remaining_summary = summarize(parsed, *load_requirement_codes(get_db_connection, major_id))
         except Exception as e:
             remaining_summary = {'error': f'Failed to compute remaining requirements: {e}'}
 
-    return jsonify({
+    response = jsonify({
         'parsed': {k: sorted(list(v)) for k, v in parsed.items()},
         'summary': remaining_summary
     })
+    response.headers['X-Audit-Cache'] = 'HIT' if cache_hit else 'MISS'
+    response.headers['X-Audit-Extractor'] = extraction['extractor']
+    return response
+
+@app.route('/api/audit/jobs/<job_id>', methods=['GET'])
+def get_audit_job(job_id):
+    """Status of an async audit upload; includes the upload result once done."""
+    job = get_audit_jobs().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    response = jsonify(job)
+    response.headers['Cache-Control'] = 'no-store'
+    return response
 
 # Get all courses with their prerequisites
 @app.route('/api/courses', methods=['GET'])
-@cache.cached(timeout=600)  # Cache for 10 minutes - this is the most expensive endpoint
+@response_cache.cached(unless=streaming_requested)
 def get_courses():
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    # Get all courses
-    cursor.execute('''
-        SELECT id, course_code, course_number, title, credits, credits_undergrad, credits_grad, description, level, difficulty
-        FROM courses
-        ORDER BY course_number
-    ''')
-    courses = cursor.fetchall()
-
-    # Fetch ALL prerequisites in one query
-    cursor.execute('''
-        SELECT course_id, prerequisite_code, group_id
-        FROM prerequisites
-        ORDER BY course_id, group_id, prerequisite_code
-    ''')
-    all_prereqs = cursor.fetchall()
-
-    # Fetch ALL grade distributions in one query
-    cursor.execute('''
-        SELECT
-            course_code,
-            SUM(grade_a) as total_a,
-            SUM(grade_b) as total_b,
-            SUM(grade_c) as total_c,
-            SUM(grade_d) as total_d,
-            SUM(grade_f) as total_f
-        FROM grade_distributions
-        GROUP BY course_code
-    ''')
-    all_grades = cursor.fetchall()
-
-    # Build lookup dictionaries for O(1) access
-    prereqs_by_course = {}
-    for prereq in all_prereqs:
-        course_id = prereq['course_id']
-        if course_id not in prereqs_by_course:
-            prereqs_by_course[course_id] = []
-        prereqs_by_course[course_id].append({
-            'code': prereq['prerequisite_code'],
-            'group': prereq['group_id']
-        })
-
-    grades_by_course = {}
-    for grade_row in all_grades:
-        total_a = grade_row['total_a'] or 0
-        total_b = grade_row['total_b'] or 0
-        total_c = grade_row['total_c'] or 0
-        total_d = grade_row['total_d'] or 0
-        total_f = grade_row['total_f'] or 0
-        total_letter = total_a + total_b + total_c + total_d + total_f
-
-        if total_letter > 0:
-            ab_pct = ((total_a + total_b) / total_letter) * 100
-            if ab_pct >= 70:
-                grades_by_course[grade_row['course_code']] = "Light"
-            elif ab_pct >= 50:
-                grades_by_course[grade_row['course_code']] = "Moderate"
-            else:
-                grades_by_course[grade_row['course_code']] = "Challenging"
-
-    # Build result with O(1) lookups instead of N queries
-    result = []
-    for course in courses:
-        # Get prerequisites from lookup
-        prereq_list = prereqs_by_course.get(course['id'], [])
-        prereq_data = format_prerequisites_from_list(prereq_list)
-
-        # Get difficulty from lookup
-        difficulty = grades_by_course.get(course['course_code'])
-        if difficulty is None:
-            difficulty = course['difficulty'] or estimate_difficulty(course['level'])
-
-        credits_undergrad = course['credits_undergrad'] or parse_credits(course['credits'])
-        credits_grad = course['credits_grad'] or parse_credits(course['credits'])
+    try:
+        model = parse_difficulty_model(request.args.get('difficultyModel'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-        result.append({
-            'id': course['course_code'].lower().replace(' ', ''),
-            'code': course['course_code'],
-            'title': course['title'],
-            'credits': credits_undergrad,
-            'creditsUndergrad': credits_undergrad,
-            'creditsGrad': credits_grad,
-            'level': course['level'],
-            'difficulty': difficulty,
-            'description': course['description'],
-            'prerequisiteGroups': prereq_data['groups'],
-            'prerequisitesFormatted': prereq_data['formatted']
-        })
+    catalog = get_catalog()
+    if streaming_requested():
+        return Response(iter_ndjson(catalog.courses, model), mimetype=NDJSON_MIMETYPE)
 
-    conn.close()
-    return jsonify(result)
+    # The full response is encoded once per catalog version and model
+    return Response(catalog.model_json[model], mimetype='application/json')
 
 # Get a single course by code
 @app.route('/api/courses/<course_code>', methods=['GET'])
+@response_cache.cached()
 def get_course(course_code):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT id, course_code, course_number, title, credits, credits_undergrad, credits_grad, description, level
-        FROM courses
-        WHERE course_code = ?
-    ''', (course_code.upper(),))
-    
-    course = cursor.fetchone()
-    
+    try:
+        model = parse_difficulty_model(request.args.get('difficultyModel'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    course = get_catalog().find(course_code)
+
     if course is None:
-        conn.close()
         return jsonify({'error': 'Course not found'}), 404
 
-    # Get prerequisites with groups
-    prereq_data = get_prerequisites_grouped(course['id'])
-
-    # Determine difficulty: use grade data if available, otherwise use level-based estimate
-    difficulty = get_difficulty_from_grades(course['course_code'])
-    if difficulty is None:
-        difficulty = estimate_difficulty(course['level'])
-
-    credits_undergrad = course['credits_undergrad'] or parse_credits(course['credits'])
-    credits_grad = course['credits_grad'] or parse_credits(course['credits'])
-
-    result = {
-        'id': course['course_code'].lower().replace(' ', ''),
-        'code': course['course_code'],
-        'title': course['title'],
-        'credits': credits_undergrad,  # Default to undergrad for backwards compatibility
-        'creditsUndergrad': credits_undergrad,
-        'creditsGrad': credits_grad,
-        'level': course['level'],
-        'difficulty': difficulty,
-        'description': course['description'],
-        'prerequisiteGroups': prereq_data['groups'],
-        'prerequisitesFormatted': prereq_data['formatted']
-    }
-
-    conn.close()
-    return jsonify(result)
+    return Response(course.to_json(model=model), mimetype='application/json')
 
 # Get eligible courses based on completed courses
+# Not in the response cache: eligibility_cache memoizes every spelling and order
+# of a completed set, and its X-Eligibility-Cache header must reach the client
 @app.route('/api/courses/eligible', methods=['POST'])
 def get_eligible_courses():
     data = request.get_json()
-    completed_codes = data.get('completed', [])
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Get all courses
-    cursor.execute('''
-        SELECT id, course_code, course_number, title, credits, credits_undergrad, credits_grad, description, level
-        FROM courses
-        ORDER BY course_number
-    ''')
-    courses = cursor.fetchall()
-    
-    eligible = []
-    
-    for course in courses:
-        # Skip if already completed
-        if course['course_code'] in completed_codes:
-            continue
-
-        # Get prerequisites with groups
-        prereq_data = get_prerequisites_grouped(course['id'])
-
-        # Check if prerequisites are met
-        # Groups are AND'd together, items within a group are OR'd
-        prereqs_met = True
-        if prereq_data['groups']:
-            for group in prereq_data['groups']:
-                # For each group, at least ONE course must be completed (OR logic within group)
-                group_met = any(prereq in completed_codes for prereq in group)
-                if not group_met:
-                    prereqs_met = False
-                    break
-
-        if prereqs_met:
-            # Determine difficulty: use grade data if available, otherwise use level-based estimate
-            difficulty = get_difficulty_from_grades(course['course_code'])
-            if difficulty is None:
-                difficulty = estimate_difficulty(course['level'])
-
-            credits_undergrad = course['credits_undergrad'] or parse_credits(course['credits'])
-            credits_grad = course['credits_grad'] or parse_credits(course['credits'])
-
-            eligible.append({
-                'id': course['course_code'].lower().replace(' ', ''),
-                'code': course['course_code'],
-                'title': course['title'],
-                'credits': credits_undergrad,  # Default to undergrad for backwards compatibility
-                'creditsUndergrad': credits_undergrad,
-                'creditsGrad': credits_grad,
-                'level': course['level'],
-                'difficulty': difficulty,
-                'description': course['description'],
-                'prerequisiteGroups': prereq_data['groups'],
-                'prerequisitesFormatted': prereq_data['formatted']
-            })
-    
-    conn.close()
-    return jsonify(eligible)
+    try:
+        model = parse_difficulty_model(request.args.get('difficultyModel'))
+        completed = parse_code_list(data.get('completed', []), 'completed')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    eligible, cache_hit = eligibility_cache.eligible(get_catalog(), completed)
+
+    # Streaming mode: chunked response, one eligible course per line
+    if streaming_requested():
+        response = Response(iter_ndjson(eligible, model), mimetype=NDJSON_MIMETYPE)
+    else:
+        response = Response(serialize_courses(eligible, model), mimetype='application/json')
+    response.headers['X-Eligibility-Cache'] = 'HIT' if cache_hit else 'MISS'
+    return response
+
+# Courses entering or leaving eligibility when codes are added to / removed from a completed set
+@app.route('/api/courses/eligible/delta', methods=['POST'])
+@response_cache.cached()
+def get_eligibility_delta():
+    data = request.get_json()
+    try:
+        model = parse_difficulty_model(request.args.get('difficultyModel'))
+        codes = [parse_code_list(data.get(field, []), field) for field in ('completed', 'added', 'removed')]
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Only courses depending on the changed codes are re-evaluated
+    entered, left, evaluated = eligibility_delta(get_catalog(), *codes)
+
+    body = b'{"entered":%b,"left":%b,"evaluated":%d}' % (
+        serialize_courses(entered, model), serialize_courses(left, model), evaluated)
+    return Response(body, mimetype='application/json')
+
+# What-if walk of a multi-term plan: newly eligible and blocked courses per term
+@app.route('/api/plan/simulate', methods=['POST'])
+@response_cache.cached()
+def simulate_course_plan():
+    data = request.get_json()
+    catalog = get_catalog()
+    try:
+        completed = parse_code_list(data.get('completed', []), 'completed')
+        in_progress = parse_code_list(data.get('inProgress', []), 'inProgress')
+        base_eligible, _ = eligibility_cache.eligible(catalog, completed)
+        terms = simulate_plan(catalog, completed, in_progress, data.get('terms', []), base_eligible)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({'terms': terms})
+
+# Hit/miss counters of this process's caches
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    return jsonify({
+        'responses': response_cache.stats(),
+        'eligibility': eligibility_cache.stats()
+    })
 
 # Get grade distribution for a course
 @app.route('/api/courses/<course_code>/grades', methods=['GET'])
+@response_cache.cached()
 def get_grade_distribution(course_code):
+    # One indexed read: the course plus its rollup prebuilt at import time
     conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Check if course exists
-    cursor.execute('''
-        SELECT id, course_code, title
-        FROM courses
-        WHERE course_code = ?
-    ''', (course_code.upper(),))
-    
-    course = cursor.fetchone()
-    
-    if course is None:
-        conn.close()
-        return jsonify({'error': 'Course not found'}), 404
-    
-    # Get all grade distributions for this course
-    cursor.execute('''
-        SELECT 
-            gd.instructor,
-            s.term,
-            s.year,
-            gd.grade_a,
-            gd.grade_b,
-            gd.grade_c,
-            gd.grade_d,
-            gd.grade_f,
-            gd.grade_w,
-            gd.grade_s,
-            gd.grade_u,
-            gd.total_students
-        FROM grade_distributions gd
-        JOIN semesters s ON gd.semester_id = s.id
-        WHERE gd.course_code = ?
-        ORDER BY s.year DESC, s.term, gd.instructor
-    ''', (course_code.upper(),))
-    
-    distributions = cursor.fetchall()
-    
-    if not distributions:
-        conn.close()
-        return jsonify({
-            'course_code': course['course_code'],
-            'course_title': course['title'],
-            'has_data': False,
-            'message': 'No grade distribution data available for this course',
-            'distributions': [],
-            'average': None
-        })
-    
-    # Format distributions
-    formatted_distributions = []
-    total_a = total_b = total_c = total_d = total_f = total_w = total_s = total_u = 0
-    total_students_all = 0
-    
-    for dist in distributions:
-        instructor, term, year, a, b, c, d, f, w, s, u, total = dist
-        
-        # Calculate percentages for this distribution
-        letter_grade_total = a + b + c + d + f
-        
-        formatted_distributions.append({
-            'instructor': instructor,
-            'semester': f"{term} {year}",
-            'term': term,
-            'year': year,
-            'grades': {
-                'A': a,
-                'B': b,
-                'C': c,
-                'D': d,
-                'F': f,
-                'W': w,
-                'S': s,
-                'U': u
-            },
-            'percentages': {
-                'A': round((a / letter_grade_total * 100), 1) if letter_grade_total > 0 else 0,
-                'B': round((b / letter_grade_total * 100), 1) if letter_grade_total > 0 else 0,
-                'C': round((c / letter_grade_total * 100), 1) if letter_grade_total > 0 else 0,
-                'D': round((d / letter_grade_total * 100), 1) if letter_grade_total > 0 else 0,
-                'F': round((f / letter_grade_total * 100), 1) if letter_grade_total > 0 else 0,
-                'W': round((w / total * 100), 1) if total > 0 else 0,
-            },
-            'total_students': total
-        })
-        
-        # Accumulate for average
-        total_a += a
-        total_b += b
-        total_c += c
-        total_d += d
-        total_f += f
-        total_w += w
-        total_s += s
-        total_u += u
-        total_students_all += total
-    
-    # Calculate overall averages
-    letter_grade_total_all = total_a + total_b + total_c + total_d + total_f
-    
-    average = {
-        'grades': {
-            'A': total_a,
-            'B': total_b,
-            'C': total_c,
-            'D': total_d,
-            'F': total_f,
-            'W': total_w,
-            'S': total_s,
-            'U': total_u
-        },
-        'percentages': {
-            'A': round((total_a / letter_grade_total_all * 100), 1) if letter_grade_total_all > 0 else 0,
-            'B': round((total_b / letter_grade_total_all * 100), 1) if letter_grade_total_all > 0 else 0,
-            'C': round((total_c / letter_grade_total_all * 100), 1) if letter_grade_total_all > 0 else 0,
-            'D': round((total_d / letter_grade_total_all * 100), 1) if letter_grade_total_all > 0 else 0,
-            'F': round((total_f / letter_grade_total_all * 100), 1) if letter_grade_total_all > 0 else 0,
-            'W': round((total_w / total_students_all * 100), 1) if total_students_all > 0 else 0,
-        },
-        'total_students': total_students_all,
-        'semesters_count': len(distributions)
-    }
-    
-    result = {
-        'course_code': course['course_code'],
-        'course_title': course['title'],
-        'has_data': True,
-        'distributions': formatted_distributions,
-        'average': average
-    }
-    
+    row = conn.execute(ROLLUP_QUERY, (normalize_code(course_code),)).fetchone()
     conn.close()
-    return jsonify(result)
-
-# Helper functions
-def parse_credits(credits_str):
-    if not credits_str:
-        return 3
-    # Extract first number from string like "3 hours" or "3-4 hours"
-    import re
-    match = re.search(r'(\d+)', credits_str)
-    return int(match.group(1)) if match else 3
-
-def estimate_difficulty(level):
-    if level <= 200:
-        return "Light"
-    elif level <= 300:
-        return "Moderate"
-    else:
-        return "Challenging"
 
-def format_prerequisites_from_list(prereq_list):
-    """
-    Format prerequisites from a list of dicts with 'code' and 'group' keys.
-    Returns: {
-        'groups': [[course1, course2], [course3], ...],
-        'formatted': 'string representation'
-    }
-    """
-    if not prereq_list:
-        return {'groups': [], 'formatted': 'None'}
-
-    from collections import defaultdict
-    groups_dict = defaultdict(list)
-    for prereq in prereq_list:
-        groups_dict[prereq['group']].append(prereq['code'])
-
-    # Convert to list of lists
-    groups = [groups_dict[gid] for gid in sorted(groups_dict.keys())]
-
-    # Format as string: (A OR B) AND C AND (D OR E)
-    formatted_parts = []
-    for group in groups:
-        if len(group) == 1:
-            formatted_parts.append(group[0])
-        else:
-            formatted_parts.append('(' + ' or '.join(group) + ')')
-
-    formatted = ' and '.join(formatted_parts) if formatted_parts else 'None'
+    if row is None:
+        return jsonify({'error': 'Course not found'}), 404
 
-    return {
-        'groups': groups,
-        'formatted': formatted
-    }
+    return Response(grade_response(row), mimetype='application/json')
 
-def get_prerequisites_grouped(course_id):
-    """
-    Get prerequisites grouped by group_id.
-    Returns: {
-        'groups': [[course1, course2], [course3], ...],  # Each inner array is OR'd, groups are AND'd
-        'formatted': 'string representation'
-    }
-    """
+# Per-instructor grade stats for a course
+@app.route('/api/courses/<course_code>/instructors', methods=['GET'])
+@response_cache.cached()
+def get_course_instructors(course_code):
+    # Stats are materialized in instructor_course_stats by the grade importer
     conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('''
-        SELECT prerequisite_code, group_id
-        FROM prerequisites
-        WHERE course_id = ?
-        ORDER BY group_id, prerequisite_code
-    ''', (course_id,))
-
-    prereq_rows = cursor.fetchall()
+    rows = conn.execute(COURSE_INSTRUCTORS_QUERY, (normalize_code(course_code),)).fetchall()
     conn.close()
 
-    if not prereq_rows:
-        return {'groups': [], 'formatted': 'None'}
-
-    # Group prerequisites by group_id
-    from collections import defaultdict
-    groups_dict = defaultdict(list)
-    for row in prereq_rows:
-        groups_dict[row['group_id']].append(row['prerequisite_code'])
-
-    # Convert to list of lists
-    groups = [groups_dict[gid] for gid in sorted(groups_dict.keys())]
-
-    # Format as string: (A OR B) AND C AND (D OR E)
-    formatted_parts = []
-    for group in groups:
-        if len(group) == 1:
-            formatted_parts.append(group[0])
-        else:
-            formatted_parts.append('(' + ' or '.join(group) + ')')
-
-    formatted = ' and '.join(formatted_parts) if formatted_parts else 'None'
-
-    return {
-        'groups': groups,
-        'formatted': formatted
-    }
+    if not rows:
+        return jsonify({'error': 'Course not found'}), 404
 
-def get_difficulty_from_grades(course_code):
-    """
-    Calculate difficulty based on grade distribution data.
-    Returns difficulty string or None if no data available.
+    return Response(course_instructors_response(rows), mimetype='application/json')
 
-    Criteria:
-    - Light: A+B >= 70%
-    - Moderate: 50% <= A+B < 70%
-    - Challenging: A+B < 50%
-    """
+# Grade stats for every course an instructor has taught (name matched case-insensitively)
+@app.route('/api/instructors/<path:name>', methods=['GET'])
+@response_cache.cached()
+def get_instructor(name):
     conn = get_db_connection()
-    cursor = conn.cursor()
-
-    # Get grade distribution for this course
-    cursor.execute('''
-        SELECT
-            SUM(gd.grade_a) as total_a,
-            SUM(gd.grade_b) as total_b,
-            SUM(gd.grade_c) as total_c,
-            SUM(gd.grade_d) as total_d,
-            SUM(gd.grade_f) as total_f
-        FROM grade_distributions gd
-        WHERE gd.course_code = ?
-    ''', (course_code,))
-
-    result = cursor.fetchone()
+    rows = conn.execute(INSTRUCTOR_COURSES_QUERY, (name.strip(),)).fetchall()
     conn.close()
 
-    if not result or result['total_a'] is None:
-        return None
+    if not rows:
+        return jsonify({'error': 'Instructor not found'}), 404
 
-    total_a = result['total_a'] or 0
-    total_b = result['total_b'] or 0
-    total_c = result['total_c'] or 0
-    total_d = result['total_d'] or 0
-    total_f = result['total_f'] or 0
+    return Response(instructor_response(rows), mimetype='application/json')
 
-    # Calculate total letter grades (excluding W, S, U)
-    total_letter_grades = total_a + total_b + total_c + total_d + total_f
+# Per-course and pooled grades for a department, optionally one level band and term range
+@app.route('/api/departments/<department>/grades', methods=['GET'])
+@response_cache.cached()
+def get_department_grades(department):
+    first, last = request.args.get('from'), request.args.get('to')
+    try:
+        params = department_grade_params(department, request.args.get('level'), first, last)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-    if total_letter_grades == 0:
-        return None
+    # Pooled from department_grade_rollups, built by the grade importer
+    conn = get_db_connection()
+    rows = conn.execute(DEPARTMENT_GRADES_QUERY, params).fetchall()
+    known = rows or conn.execute(DEPARTMENT_EXISTS_QUERY, params[:1]).fetchone()
+    conn.close()
 
-    # Calculate A+B percentage
-    ab_percentage = ((total_a + total_b) / total_letter_grades) * 100
+    if not known:
+        return jsonify({'error': 'Department not found'}), 404
 
-    if ab_percentage >= 70:
-        return "Light"
-    elif ab_percentage >= 50:
-        return "Moderate"
-    else:
-        return "Challenging"
+    return Response(department_grades_response(params, rows, first, last), mimetype='application/json')
 
 if __name__ == '__main__':
     print("="*50)
@@ -735,9 +393,17 @@ if __name__ == '__main__':
     print("  GET  /api/courses - Get all courses")
     print("  GET  /api/courses/<code> - Get single course")
     print("  GET  /api/courses/<code>/grades - Get grade distribution")
+    print("  GET  /api/courses/<code>/instructors - Get per-instructor grade stats")
+    print("  GET  /api/instructors/<name> - Get an instructor's grade stats by course")
+    print("  GET  /api/departments/<dept>/grades - Get department grades (?level=300&from=Fall 2022&to=2024)")
     print("  POST /api/courses/eligible - Get eligible courses")
+    print("  POST /api/courses/eligible/delta - Get courses entering/leaving eligibility")
+    print("  POST /api/plan/simulate - Simulate a multi-term plan")
+    print("  GET  /api/cache/stats - Response and eligibility cache hit/miss counters")
     print("  GET  /api/majors - Get all majors")
     print("  GET  /api/majors/<id>/requirements - Get major requirements")
+    print("  POST /api/audit/upload[?async=1] - Parse a degree audit PDF")
+    print("  GET  /api/audit/jobs/<id> - Get async audit job status")
     print("\nPress CTRL+C to quit\n")
     print("="*50)
 
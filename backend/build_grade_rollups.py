@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+Rebuild the precomputed grade tables the API reads from: grade_rollups
+(grades endpoints), instructor_course_stats (instructor endpoints) and
+department_grade_rollups (department endpoint).
+
+grade_distribution_importer.py and add_missing_courses.py run this after
+writing grade rows; run it by hand after editing grade_distributions any
+other way.
+
+Usage: python build_grade_rollups.py [path/to/uic_courses.db]
+"""
+import sqlite3
+import os
+import sys
+
+# Rollup format is shared with the API in ../api
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+from _grades import build_grade_rollups, build_instructor_stats, build_department_rollups
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATABASE = os.path.join(BASE_DIR, 'uic_courses.db')
+
+def rebuild(conn):
+    count = build_grade_rollups(conn)
+    print(f"✓ Built grade rollups for {count} courses")
+    pairs = build_instructor_stats(conn)
+    print(f"✓ Built instructor stats for {pairs} instructor/course pairs")
+    cells = build_department_rollups(conn)
+    print(f"✓ Built department rollups for {cells} course/semester rows")
+    return count
+
+if __name__ == '__main__':
+    conn = sqlite3.connect(sys.argv[1] if len(sys.argv) > 1 else DATABASE)
+    rebuild(conn)
+    conn.close()
@@ -0,0 +1,37 @@
+"""
+Flask JSON provider backed by the shared encoder in ../api/_fastjson.py.
+Uses orjson when it is installed and keeps DefaultJSONProvider's behaviour
+(sort_keys, default, compact/indented output) otherwise.
+"""
+import os
+import sys
+
+from flask.json.provider import DefaultJSONProvider
+
+# The encoder is shared with the Vercel handlers in ../api
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+from _fastjson import orjson, loads
+
+# Dates and dataclasses go through DefaultJSONProvider.default so they are
+# encoded exactly as the stdlib provider encodes them
+_PASSTHROUGH = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS) if orjson else 0
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Route jsonify() and request.get_json() through orjson when available."""
+
+    def dumps(self, obj, **kwargs):
+        # Indented output (debug mode) and encoder options (e.g. the session
+        # serializer) keep stdlib behaviour; compact separators are orjson's own
+        if orjson is None or set(kwargs) - {'separators'}:
+            return super().dumps(obj, **kwargs)
+        option = _PASSTHROUGH | (orjson.OPT_SORT_KEYS if self.sort_keys else 0)
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+        except TypeError:
+            # Types orjson refuses (e.g. ints over 64 bits) go through the stdlib
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
@@ -2,6 +2,14 @@ import requests
 from bs4 import BeautifulSoup
 import sqlite3
 import re
+import os
+import sys
+
+# Course code normalization is shared with the API in ../api
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+from _course_codes import make_code, normalize_code
+from migrate_course_ids import backfill_course_ids
+from build_grade_rollups import rebuild as rebuild_grade_rollups
 
 def estimate_difficulty(level, prereq_count, credits_num, description):
     """
@@ -105,10 +113,7 @@ def parse_prerequisites(prereq_text, department):
         # Extract department and number
         match = re.match(r'([A-Z]{2,4})\s*(\d{3})', code, re.IGNORECASE)
         if match:
-            dept = match.group(1).upper()
-            num = match.group(2)
-            normalized_code = f"{dept} {num}"
-            normalized.append(normalized_code)
+            normalized.append(make_code(match.group(1), match.group(2)))
 
     return list(set(normalized))  # Remove duplicates
 
@@ -149,9 +154,8 @@ def scrape_department_courses(department, url):
                 print(f"Could not parse: {title_text}")
                 continue
 
-            course_code = code_match.group(1).strip().upper()
-            # Normalize spaces
-            course_code = course_code.replace('\xa0', ' ').replace('\u00a0', ' ')
+            # Catalog HTML separates department and number with a non-breaking space
+            course_code = normalize_code(code_match.group(1))
 
             course_title = code_match.group(2).strip()
             # Clean up title
@@ -522,11 +526,19 @@ def main(departments=None):
             import traceback
             traceback.print_exc()
 
+    cursor = conn.cursor()
+
+    # Grade and requirement rows imported before their course was scraped
+    # get their course_id now
+    unmatched = backfill_course_ids(cursor)
+    conn.commit()
+    if 'grade_distributions' in unmatched:
+        rebuild_grade_rollups(conn)
+
     # Display summary
     print("\n" + "="*60)
     print("SUMMARY")
     print("="*60)
-    cursor = conn.cursor()
 
     for dept_code in departments:
         if dept_code in DEPARTMENTS:
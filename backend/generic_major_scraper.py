@@ -2,6 +2,13 @@ import requests
 from bs4 import BeautifulSoup
 import sqlite3
 import re
+import os
+import sys
+
+# Course code normalization is shared with the API in ../api
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+from _course_codes import make_code
+from migrate_course_ids import add_course_id_columns, course_id_index
 
 # Configuration for different majors (CS + Data Science)
 MAJOR_CONFIGS = {
@@ -138,6 +145,7 @@ def create_major_tables():
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             major_id INTEGER NOT NULL,
             course_code TEXT NOT NULL,
+            course_id INTEGER REFERENCES courses(id),
             requirement_type TEXT NOT NULL,
             FOREIGN KEY (major_id) REFERENCES majors(id),
             UNIQUE(major_id, course_code)
@@ -150,6 +158,7 @@ def create_major_tables():
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             major_id INTEGER NOT NULL,
             course_code TEXT NOT NULL,
+            course_id INTEGER REFERENCES courses(id),
             elective_type TEXT NOT NULL,
             FOREIGN KEY (major_id) REFERENCES majors(id),
             UNIQUE(major_id, course_code)
@@ -170,6 +179,8 @@ def create_major_tables():
             UNIQUE(major_id, group_name)
         )
     ''')
+    # Databases created before course_id existed
+    add_course_id_columns(cursor, ('major_requirements', 'major_electives'))
 
     conn.commit()
     return conn
@@ -320,7 +331,7 @@ def scrape_major_requirements(url, config):
                     course_text = code_link.get_text(strip=True)
                     match = course_pattern.match(course_text)
                     if match:
-                        course_code = f"{match.group(1)} {match.group(2)}"
+                        course_code = make_code(match.group(1), match.group(2))
                         dept = match.group(1)
 
                         if is_elective:
@@ -394,6 +405,9 @@ def insert_major_requirements(conn, requirements, electives, summary_groups, maj
         return
     major_id = result[0]
 
+    # courses.id for each code, written next to course_code
+    course_ids = course_id_index(cursor)
+
     # Insert requirements
     total_courses = 0
     for req_type, courses in requirements.items():
@@ -401,9 +415,9 @@ def insert_major_requirements(conn, requirements, electives, summary_groups, maj
             try:
                 cursor.execute('''
                     INSERT OR IGNORE INTO major_requirements
-                    (major_id, course_code, requirement_type)
-                    VALUES (?, ?, ?)
-                ''', (major_id, course_code, req_type))
+                    (major_id, course_code, course_id, requirement_type)
+                    VALUES (?, ?, ?, ?)
+                ''', (major_id, course_code, course_ids.lookup(course_code), req_type))
                 total_courses += 1
             except sqlite3.IntegrityError:
                 print(f"Duplicate: {course_code}")
@@ -415,9 +429,9 @@ def insert_major_requirements(conn, requirements, electives, summary_groups, maj
             try:
                 cursor.execute('''
                     INSERT OR IGNORE INTO major_electives
-                    (major_id, course_code, elective_type)
-                    VALUES (?, ?, ?)
-                ''', (major_id, course_code, elective_type))
+                    (major_id, course_code, course_id, elective_type)
+                    VALUES (?, ?, ?, ?)
+                ''', (major_id, course_code, course_ids.lookup(course_code), elective_type))
                 total_electives += 1
             except sqlite3.IntegrityError:
                 print(f"Duplicate elective: {course_code}")
@@ -473,6 +487,7 @@ def scrape_all_majors(major_keys=None, test_mode=False):
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 major_id INTEGER NOT NULL,
                 course_code TEXT NOT NULL,
+                course_id INTEGER REFERENCES courses(id),
                 requirement_type TEXT NOT NULL,
                 FOREIGN KEY (major_id) REFERENCES majors(id),
                 UNIQUE(major_id, course_code)
@@ -484,11 +499,13 @@ def scrape_all_majors(major_keys=None, test_mode=False):
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 major_id INTEGER NOT NULL,
                 course_code TEXT NOT NULL,
+                course_id INTEGER REFERENCES courses(id),
                 elective_type TEXT NOT NULL,
                 FOREIGN KEY (major_id) REFERENCES majors(id),
                 UNIQUE(major_id, course_code)
             )
         ''')
+        add_course_id_columns(cursor, ('major_requirements', 'major_electives'))
 
         conn.commit()
         return conn
@@ -2,8 +2,15 @@ import sqlite3
 import csv
 import os
 import re
+import sys
 from pathlib import Path
 
+# Course code normalization is shared with the API in ../api
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+from _course_codes import make_code
+from migrate_course_ids import add_course_id_columns, course_id_index
+from build_grade_rollups import rebuild as rebuild_grade_rollups
+
 def create_grade_tables():
     """Create tables for grade distributions"""
     conn = sqlite3.connect('uic_courses.db')
@@ -24,6 +31,7 @@ def create_grade_tables():
         CREATE TABLE IF NOT EXISTS grade_distributions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             course_code TEXT NOT NULL,
+            course_id INTEGER REFERENCES courses(id),
             semester_id INTEGER NOT NULL,
             instructor TEXT,
             grade_a INTEGER DEFAULT 0,
@@ -39,6 +47,8 @@ def create_grade_tables():
             UNIQUE(course_code, semester_id, instructor)
         )
     ''')
+    # Databases created before course_id existed
+    add_course_id_columns(cursor, ('grade_distributions',))
     
     conn.commit()
     return conn
@@ -82,7 +92,7 @@ def insert_or_get_semester(cursor, term, year):
 
 def normalize_course_code(dept, number):
     """Normalize course code to match database format (e.g., 'CS 141')"""
-    return f"{dept} {number}"
+    return make_code(dept, number)
 
 def import_grade_csv(conn, csv_path):
     """Import grades from a single CSV file"""
@@ -97,6 +107,9 @@ def import_grade_csv(conn, csv_path):
     
     imported_count = 0
     skipped_count = 0
+
+    # courses.id for every code; rows for courses not scraped yet keep a NULL course_id
+    course_ids = course_id_index(cursor)
     
     with open(csv_path, 'r', encoding='utf-8-sig') as f:
         reader = csv.DictReader(f)
@@ -139,10 +152,10 @@ def import_grade_csv(conn, csv_path):
                 # Insert or replace grade distribution
                 cursor.execute('''
                     INSERT OR REPLACE INTO grade_distributions
-                    (course_code, semester_id, instructor, grade_a, grade_b, grade_c, 
+                    (course_code, course_id, semester_id, instructor, grade_a, grade_b, grade_c, 
                      grade_d, grade_f, grade_w, grade_s, grade_u, total_students)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (course_code, semester_id, instructor, grade_a, grade_b, grade_c,
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (course_code, course_ids.lookup(course_code), semester_id, instructor, grade_a, grade_b, grade_c,
                       grade_d, grade_f, grade_w, grade_s, grade_u, total_students))
                 
                 imported_count += 1
@@ -188,6 +201,9 @@ def import_all_csv_files(directory_path='.'):
         except Exception as e:
             print(f"\n✗ Error importing {csv_file.name}: {e}")
             continue
+
+    # Precompute what the grades endpoints serve
+    rebuild_grade_rollups(conn)
     
     # Display summary statistics
     print("\n" + "="*60)
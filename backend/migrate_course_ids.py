@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Add integer course_id foreign keys next to the TEXT course_code columns of
+grade_distributions, major_requirements and major_electives.
+
+The columns are populated from courses.id and indexed so the API can join
+and group on integers. Safe to run repeatedly: existing columns are kept and
+only rows still missing a course_id are backfilled. The course scraper and
+add_missing_courses.py run the backfill again after adding courses.
+
+Usage: python migrate_course_ids.py [path/to/uic_courses.db]
+"""
+import sqlite3
+import os
+import sys
+
+# Course code normalization is shared with the API in ../api
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+from _course_codes import CourseCodeIndex
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATABASE = os.path.join(BASE_DIR, 'uic_courses.db')
+
+# Tables that reference courses by code
+COURSE_TABLES = ('grade_distributions', 'major_requirements', 'major_electives')
+
+# Covering indexes for the integer-keyed read paths
+COURSE_ID_INDEXES = {
+    # Per-course grade lookups by course_id
+    'idx_grade_distributions_course_id':
+        'grade_distributions(course_id, grade_a, grade_b, grade_c, grade_d, grade_f)',
+    # Requirement listings: WHERE major_id = ? ORDER BY type, code
+    'idx_major_requirements_major_course_id':
+        'major_requirements(major_id, requirement_type, course_code, course_id)',
+    'idx_major_electives_major_course_id':
+        'major_electives(major_id, elective_type, course_code, course_id)',
+}
+
+def has_column(cursor, table, column):
+    cursor.execute(f'PRAGMA table_info({table})')
+    return any(row[1] == column for row in cursor.fetchall())
+
+def course_id_index(cursor):
+    """
+    CourseCodeIndex over the courses table, for importers resolving course_id
+    as they write. Empty when the database has no courses table (e.g. the
+    scraper's test database), so every course_id stays NULL there.
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'courses'")
+    if cursor.fetchone() is None:
+        return CourseCodeIndex()
+    cursor.execute('SELECT id, course_code FROM courses')
+    return CourseCodeIndex(cursor.fetchall())
+
+def add_course_id_columns(cursor, tables=COURSE_TABLES):
+    """Add the course_id column to each table that lacks it."""
+    for table in tables:
+        if not has_column(cursor, table, 'course_id'):
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN course_id INTEGER REFERENCES courses(id)')
+            print(f"Added {table}.course_id")
+
+def backfill_course_ids(cursor, tables=COURSE_TABLES):
+    """
+    Fill course_id from courses.id wherever it is still NULL. Codes are
+    matched through normalize_code, so "CS141" or "cs 141" rows find the
+    "CS 141" course. Tables without a course_id column are skipped.
+    Returns {table: rows still unmatched} (codes with no row in courses).
+    """
+    course_ids = course_id_index(cursor)
+    unmatched = {}
+    for table in tables:
+        if not has_column(cursor, table, 'course_id'):
+            continue
+        cursor.execute(f'SELECT DISTINCT course_code FROM {table} WHERE course_id IS NULL')
+        matches = []
+        for (code,) in cursor.fetchall():
+            course_id = course_ids.lookup(code)
+            if course_id is not None:
+                matches.append((course_id, code))
+        cursor.executemany(
+            f'UPDATE {table} SET course_id = ? WHERE course_id IS NULL AND course_code = ?', matches)
+        print(f"Backfilled {table}.course_id for {cursor.rowcount if matches else 0} rows")
+        cursor.execute(f'SELECT COUNT(*) FROM {table} WHERE course_id IS NULL')
+        unmatched[table] = cursor.fetchone()[0]
+    return unmatched
+
+def create_course_id_indexes(cursor):
+    for name, definition in COURSE_ID_INDEXES.items():
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {definition}')
+        print(f"Created index {name}")
+
+def migrate(database=DATABASE):
+    conn = sqlite3.connect(database)
+    cursor = conn.cursor()
+
+    print(f"Migrating {database}...")
+    add_course_id_columns(cursor)
+    unmatched = backfill_course_ids(cursor)
+    create_course_id_indexes(cursor)
+    conn.commit()
+    conn.close()
+
+    for table, count in unmatched.items():
+        if count:
+            print(f"Note: {count} {table} rows reference codes missing from courses; "
+                  f"their course_id stays NULL until those courses are added")
+    print("\nMigration complete!")
+
+if __name__ == '__main__':
+    migrate(sys.argv[1] if len(sys.argv) > 1 else DATABASE)
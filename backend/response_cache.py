@@ -0,0 +1,236 @@
+"""
+Response cache for the Flask API, keyed by catalog version.
+
+Every key starts with the database version (file mtime and size), so a
+rebuilt database is a new key space: the first request after a rebuild
+misses, and entries for the old version are never served again and age out
+of the store. No timeout is needed.
+
+Stores:
+    LRUStore         in-process, bounded by total cached body bytes (default)
+    FileSystemStore  one file per response in a shared directory, so every
+                     gunicorn worker on the host reuses the same entries
+
+RESPONSE_CACHE=memory|filesystem picks the store; RESPONSE_CACHE_MAX_BYTES
+and RESPONSE_CACHE_DIR tune it.
+"""
+import functools
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+from flask import Response, make_response, request
+
+# Defaults can be tuned per deployment without code changes
+DEFAULT_STORE = os.environ.get('RESPONSE_CACHE', 'memory')
+DEFAULT_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+DEFAULT_DIRECTORY = os.environ.get(
+    'RESPONSE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'coursescope-response-cache'))
+
+# Deterministic for a given catalog version: successes and "not found"
+CACHEABLE_STATUSES = (200, 404)
+
+class LRUStore:
+    """In-process LRU of (status, mimetype, body) entries, capped at max_bytes of body."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version, key):
+        with self._lock:
+            entry = self._entries.get((version, key))
+            if entry is not None:
+                self._entries.move_to_end((version, key))
+            return entry
+
+    def put(self, version, key, entry):
+        body = entry[2]
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop((version, key), None)
+            if previous is not None:
+                self.size -= len(previous[2])
+            self._entries[(version, key)] = entry
+            self.size += len(body)
+            # Entries of an older version are never read again; they are the
+            # least recently used and go first
+            while self.size > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+class FileSystemStore:
+    """
+    Entries as files under directory/<version>/, shared by every process on
+    the host. Writes are atomic (temp file + rename); the first write for a
+    new version removes the directories of older versions (never newer ones,
+    so a request that started before a rebuild cannot wipe fresh entries).
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._current = None
+        self._written = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, version, key):
+        return os.path.join(self.directory, version, key)
+
+    def get(self, version, key):
+        try:
+            with open(self._path(version, key), 'rb') as f:
+                status, mimetype = f.readline().decode('ascii').split(' ', 1)
+                return int(status), mimetype.rstrip('\n'), f.read()
+        except (OSError, ValueError):
+            return None
+
+    def put(self, version, key, entry):
+        status, mimetype, body = entry
+        if len(body) > self.max_bytes:
+            return
+        if version != self._current:
+            self._switch_version(version)
+        path = self._path(version, key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(f"{status} {mimetype}\n".encode('ascii'))
+                f.write(body)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(tmp_path)
+            return
+        self._written += len(body)
+        if self._written > self.max_bytes // 8:
+            self._written = 0
+            self._prune(version)
+
+    def _switch_version(self, version):
+        os.makedirs(os.path.join(self.directory, version), exist_ok=True)
+        for name in os.listdir(self.directory):
+            if _version_mtime(name) < _version_mtime(version):
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+        self._current = version
+
+    def _prune(self, version):
+        """Drop the oldest entries of version until the directory fits in max_bytes."""
+        directory = os.path.join(self.directory, version)
+        files = []
+        for name in os.listdir(directory):
+            try:
+                stat = os.stat(os.path.join(directory, name))
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in files)
+        for _, size, name in sorted(files):
+            if total <= self.max_bytes:
+                break
+            self._remove(os.path.join(directory, name))
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+        self._current = None
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def _version_mtime(name):
+    """Database mtime encoded in a version directory name ("<mtime_ns>-<size>")."""
+    try:
+        return int(name.split('-', 1)[0])
+    except ValueError:
+        return -1
+
+def make_store(name=DEFAULT_STORE):
+    """Store for a RESPONSE_CACHE value; falls back to memory if the directory is unusable."""
+    if name == 'filesystem':
+        try:
+            return FileSystemStore()
+        except OSError:
+            pass
+    elif name != 'memory':
+        raise ValueError(f"Unknown RESPONSE_CACHE store '{name}' (expected memory or filesystem)")
+    return LRUStore()
+
+class ResponseCache:
+    """
+    Caches whole Flask responses per catalog version.
+    version: callable returning the current catalog version token.
+    """
+
+    def __init__(self, version, store=None):
+        self.version = version
+        self.store = store if store is not None else make_store()
+        self.hits = 0
+        self.misses = 0
+        # Counters are shared by every request thread of the process
+        self._lock = threading.Lock()
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def request_key(self):
+        """Digest of everything a read route's response depends on besides the catalog."""
+        digest = hashlib.sha256()
+        digest.update(f"{request.method} {request.path}\n".encode('utf-8'))
+        for name, value in sorted(request.args.items(multi=True)):
+            digest.update(f"{name}={value}\n".encode('utf-8'))
+        if request.method == 'POST':
+            digest.update(request.get_data())
+        return digest.hexdigest()
+
+    def cached(self, unless=None):
+        """
+        Decorator for read routes; unless() returning True bypasses the cache (e.g. streaming).
+        Only status, mimetype and body are stored, so routes setting their own
+        headers should not use it.
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                if unless is not None and unless():
+                    return view(*args, **kwargs)
+
+                version = '-'.join(str(part) for part in self.version())
+                key = self.request_key()
+                entry = self.store.get(version, key)
+                if entry is not None:
+                    self._count(True)
+                    status, mimetype, body = entry
+                    return Response(body, status=status, mimetype=mimetype)
+
+                self._count(False)
+                response = make_response(view(*args, **kwargs))
+                if response.status_code in CACHEABLE_STATUSES and not response.is_streamed:
+                    self.store.put(version, key, (response.status_code, response.mimetype,
+                                                  response.get_data()))
+                return response
+            return wrapper
+        return decorator
+
+    def stats(self):
+        with self._lock:
+            return {'store': type(self.store).__name__, 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark the audit line scanner on synthetic audit text.
+Generates a 50-page audit (course lines, section headers, alternatives,
+noise), parses it with the current AuditTextParser and with a copy of the
+previous per-line logic, and checks both produce identical course sets.
+Usage: python bench_audit_scanner.py [pages] [iterations]
+"""
+import sys
+import os
+import re
+import random
+import time
+
+# Add api to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+
+from _audit_parser import AuditTextParser
+from _audit_parser.text import SEMESTER_COURSE_PATTERN, STATUS_KEYWORDS, GRADE_PATTERN
+from _course_codes import make_code
+
+DEPARTMENTS = ["CS", "MATH", "BIOS", "CHEM", "ENGL", "PHYS", "STAT", "IE", "ECE", "SHIP", "IPH"]
+TERMS = ["FA", "SP", "SU", "WS", "SS"]
+HEADERS = ["Completed Courses", "In Progress", "Still Needed: 2 courses", "Planned Future",
+           "Requirement Satisfied", "Not Met", "CURRENT TERM", "Earned: 45.0 hours",
+           "Remaining courses", "Book list OK"]
+NOISE = ["GPA 3.45 A", "Transfer credit NO TRANSFER", "FA 21 SP 22", "Total hours 120.0"]
+
+# Previous course extraction, kept only as the parity reference
+COURSE_CODE_PATTERN = re.compile(r"\b([A-Z]{2,4})\s+(\d{2,3})([A-Z]{1,2})?\b")
+EXCLUDE_PATTERNS = [
+    re.compile(r"^(FA|SP|SU|WS|SS)\s+\d{2}$"),
+    re.compile(r"^(HN|IP)\s+\d{2,3}$"),
+    re.compile(r"^(NO|TRANSFER)\s"),
+]
+
+def legacy_extract_courses_from_line(line, current_status):
+    courses = []
+    for match in SEMESTER_COURSE_PATTERN.finditer(line):
+        semester, dept, num, suffix = match.groups()
+        courses.append((make_code(dept, num + (suffix or "")), current_status))
+    if not courses:
+        for match in COURSE_CODE_PATTERN.finditer(line):
+            dept, num, suffix = match.groups()
+            if not any(pattern.match(match.group(0)) for pattern in EXCLUDE_PATTERNS):
+                courses.append((make_code(dept, num + (suffix or "")), current_status))
+    return courses
+
+def legacy_classify_line(line):
+    for status, keywords in STATUS_KEYWORDS.items():
+        for kw in keywords:
+            if kw.lower() in line.lower():
+                return status
+    if GRADE_PATTERN.search(line):
+        return "completed"
+    return None
+
+class LegacyAuditTextParser(AuditTextParser):
+    """The per-line logic before the single-pass scanner, kept as a reference."""
+
+    def _parse_line(self, line):
+        line_status = legacy_classify_line(line)
+        if line_status:
+            self.current_status = line_status
+
+        semester_match = SEMESTER_COURSE_PATTERN.search(line)
+        if semester_match:
+            grade_match = re.search(r'\d+\.\d+\s+([A-Z][+-]?)\s+', line)
+            if grade_match:
+                line_status = 'completed'
+            elif 'IP' in line or 'IN PROGRESS' in line.upper():
+                line_status = 'in_progress'
+            elif self.current_status:
+                line_status = self.current_status
+            else:
+                line_status = 'completed'
+
+            for course_code, status in legacy_extract_courses_from_line(line, line_status):
+                if status == 'completed':
+                    self.completed.add(course_code)
+                elif status == 'in_progress':
+                    self.in_progress.add(course_code)
+
+def synthetic_pages(pages, seed=0, lines_per_page=40):
+    rnd = random.Random(seed)
+    result = []
+    for page in range(pages):
+        lines = [f"Page {page + 1} of {pages}", "Academic Audit - University of Illinois Chicago"]
+        for i in range(lines_per_page):
+            r = rnd.random()
+            if r < 0.15:
+                lines.append(rnd.choice(HEADERS))
+            elif r < 0.75:
+                term = f"{rnd.choice(TERMS)}{rnd.randint(15, 25)}{rnd.choice([' ', ''])}"
+                course = f"{rnd.choice(DEPARTMENTS)} {rnd.randint(10, 599)}{rnd.choice(['', '', '', 'H', 'L'])}"
+                credits = rnd.choice(["3.00", "4.00", "1.00"])
+                grade = rnd.choice(["A", "B+", "C", "D", "F", "IP", "W", "", ""])
+                note = rnd.choice(["", "", "IP", "in progress"])
+                lines.append(f"{term}{course} {credits} {grade} Introduction to Topic {i} {note}")
+            elif r < 0.9:
+                lines.append(f"{rnd.choice(DEPARTMENTS)} {rnd.randint(100, 499)} or "
+                             f"{rnd.choice(DEPARTMENTS)} {rnd.randint(100, 499)}")
+            else:
+                lines.append(rnd.choice(NOISE))
+        result.append("\n".join(lines))
+    return result
+
+def run(parser_class, pages):
+    parser = parser_class()
+    parser.feed_pages(iter(pages))
+    return parser.completed, parser.in_progress
+
+def best_time(fn, iterations):
+    best = None
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+if __name__ == "__main__":
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    # Output parity over several generated documents
+    for seed in range(20):
+        pages = synthetic_pages(page_count, seed)
+        if run(AuditTextParser, pages) != run(LegacyAuditTextParser, pages):
+            print(f"Output differs from the previous parser (seed {seed})")
+            sys.exit(1)
+
+    pages = synthetic_pages(page_count)
+    line_count = sum(page.count("\n") + 1 for page in pages)
+    print(f"{page_count} pages, {line_count} lines")
+    legacy = best_time(lambda: run(LegacyAuditTextParser, pages), iterations)
+    current = best_time(lambda: run(AuditTextParser, pages), iterations)
+    print(f"  previous parser   {legacy * 1000:8.2f} ms")
+    print(f"  current parser    {current * 1000:8.2f} ms   ({legacy / current:.1f}x)")
+    print("Output identical: yes")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Compare audit PDF text extractors on a folder of sample audits.
+For every PDF, each extractor is timed end to end (extraction + parsing) and
+its parsed course sets are checked against the pdfplumber baseline.
+Usage: python bench_extractors.py <folder> [iterations]
+"""
+import sys
+import os
+import time
+
+# Add api to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+
+from _audit_parser import EXTRACTORS, AuditTextParser, parse_pdf_detailed
+
+BASELINE = "pdfplumber"
+
+def parse_with(iter_pages, pdf_bytes):
+    parser = AuditTextParser()
+    parser.feed_pages(iter_pages(pdf_bytes))
+    return {"completed": parser.completed, "in_progress": parser.in_progress}
+
+def best_time(fn, iterations):
+    best = None
+    result = None
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__.strip())
+        sys.exit(1)
+    folder = sys.argv[1]
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    paths = sorted(os.path.join(folder, n) for n in os.listdir(folder) if n.lower().endswith('.pdf'))
+    if not paths:
+        print(f"No PDFs found in {folder}")
+        sys.exit(1)
+
+    totals = {name: 0.0 for name, _ in EXTRACTORS}
+    mismatches = 0
+    for path in paths:
+        with open(path, 'rb') as f:
+            pdf_bytes = f.read()
+        print(f"\n{os.path.basename(path)} ({len(pdf_bytes) / 1024:.1f} KiB)")
+
+        results = {}
+        for name, iter_pages in EXTRACTORS:
+            try:
+                seconds, parsed = best_time(lambda: parse_with(iter_pages, pdf_bytes), iterations)
+            except Exception as e:
+                print(f"  {name:<12} unavailable: {e}")
+                continue
+            totals[name] += seconds
+            results[name] = parsed
+            count = len(parsed["completed"]) + len(parsed["in_progress"])
+            print(f"  {name:<12} {seconds * 1000:9.1f} ms   {count:4d} courses")
+
+        baseline = results.get(BASELINE)
+        for name, parsed in results.items():
+            if baseline is not None and name != BASELINE and parsed != baseline:
+                mismatches += 1
+                for key in ("completed", "in_progress"):
+                    missing = sorted(baseline[key] - parsed[key])
+                    extra = sorted(parsed[key] - baseline[key])
+                    if missing or extra:
+                        print(f"  {name} differs from {BASELINE} in {key}: -{missing} +{extra}")
+
+        _, chosen = parse_pdf_detailed(pdf_bytes)
+        print(f"  parse_pdf uses: {chosen}")
+
+    print("\nTotal (best of %d):" % iterations)
+    for name, seconds in totals.items():
+        print(f"  {name:<12} {seconds * 1000:9.1f} ms")
+    print(f"\nParse mismatches vs {BASELINE}: {mismatches}")
+    sys.exit(1 if mismatches else 0)
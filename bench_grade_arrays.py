@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Compare SQL GROUP BY rollups of grade_distributions with the NumPy grade arrays.
+Usage: python bench_grade_arrays.py [iterations] [path/to/uic_courses.db]
+Defaults to api/uic_courses.db (migrated with backend/migrate_course_ids.py).
+"""
+import sys
+import os
+import sqlite3
+import timeit
+
+# Add api to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api'))
+
+import numpy as np
+
+from _db import DATABASE
+from _grades import grade_percentages
+from _grade_arrays import GradeArrays, cache_paths, difficulty_labels, get_grade_arrays, percentages
+
+COUNT_COLUMNS = 'grade_a, grade_b, grade_c, grade_d, grade_f, grade_w, grade_s, grade_u'
+SUMS = ', '.join(f'SUM(gd.{column.strip()})' for column in COUNT_COLUMNS.split(','))
+
+def scalar_difficulty(total_a, total_b, total_c, total_d, total_f):
+    """Reference scalar difficulty label (the pre-NumPy per-course helper)."""
+    total_letter_grades = total_a + total_b + total_c + total_d + total_f
+    if total_letter_grades == 0:
+        return None
+    ab_percentage = ((total_a + total_b) / total_letter_grades) * 100
+    if ab_percentage >= 70:
+        return "Light"
+    elif ab_percentage >= 50:
+        return "Moderate"
+    return "Challenging"
+
+def sql_per_course(conn):
+    return conn.execute(f'''
+        SELECT gd.course_id, {SUMS} FROM grade_distributions gd
+        GROUP BY gd.course_id ORDER BY gd.course_id
+    ''').fetchall()
+
+def sql_per_department(conn):
+    return conn.execute(f'''
+        SELECT substr(c.course_code, 1, instr(c.course_code, ' ') - 1) AS dept, {SUMS}
+        FROM grade_distributions gd JOIN courses c ON c.id = gd.course_id
+        GROUP BY dept ORDER BY dept
+    ''').fetchall()
+
+def sql_per_term(conn):
+    return conn.execute(f'''
+        SELECT gd.semester_id, {SUMS} FROM grade_distributions gd
+        GROUP BY gd.semester_id ORDER BY gd.semester_id
+    ''').fetchall()
+
+def sql_campus(conn):
+    return conn.execute(f'SELECT {SUMS} FROM grade_distributions gd').fetchone()
+
+def bench(label, fn, iterations):
+    seconds = timeit.timeit(fn, number=iterations) / iterations
+    print(f"  {label:<40} {seconds * 1000:8.2f} ms")
+    return seconds
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    database = sys.argv[2] if len(sys.argv) > 2 else DATABASE
+    conn = sqlite3.connect(database)
+
+    for path in cache_paths(database):
+        if os.path.exists(path):
+            os.remove(path)
+
+    print("Loading:")
+    bench("GradeArrays.from_database()", lambda: GradeArrays.from_database(database), 3)
+    arrays = get_grade_arrays(database)
+    npz = next(path for path in cache_paths(database) if os.path.exists(path))
+    bench(f"GradeArrays.load({os.path.basename(npz)})", lambda: GradeArrays.load(npz), iterations)
+    print(f"  {len(arrays.counts)} sections, {len(arrays.course_ids)} courses, "
+          f"{len(arrays.departments)} departments, {len(arrays.terms)} terms, "
+          f"{len(arrays.instructors)} instructors; {os.path.getsize(npz) / 1024:.0f} KiB on disk\n")
+
+    print("Rollups:")
+    pairs = (
+        ("per course", sql_per_course, arrays.per_course),
+        ("per department", sql_per_department, arrays.per_department),
+        ("per term", sql_per_term, arrays.per_term),
+    )
+    for label, sql, vectorized in pairs:
+        slow = bench(f"SQL GROUP BY ({label})", lambda: sql(conn), iterations)
+        fast = bench(f"bincount ({label})", vectorized, iterations)
+        rows = sql(conn)
+        assert np.array_equal(np.array([row[1:] for row in rows], dtype=np.int64), vectorized()), label
+        print(f"  {'':<40} {slow / fast:8.0f}x\n")
+    bench("SQL SUM (campus)", lambda: sql_campus(conn), iterations)
+    bench("counts.sum (campus)", arrays.campus, iterations)
+    assert np.array_equal(np.array(sql_campus(conn), dtype=np.int64), arrays.campus())
+
+    # Derived values must match the scalar percentage helper and the reference difficulty
+    totals = arrays.per_course()
+    expected = [list(grade_percentages(*row[:6], row.sum()).values()) for row in totals]
+    assert np.array_equal(percentages(totals), np.array(expected, dtype=np.float64))
+    assert difficulty_labels(totals) == [scalar_difficulty(*row[:5]) for row in totals]
+    print("\nRollups, percentages and difficulty labels match the SQL and scalar paths")
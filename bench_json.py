@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Compare JSON encoders on the real /api/courses payload.
+Usage: python bench_json.py [iterations]
+Requires backend/uic_courses.db.
+"""
+import sys
+import os
+import json
+import timeit
+
+# The catalog lives in api/; point it at the backend's database
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+
+from _db import use_database
+from _catalog import get_catalog, serialize_courses
+from _fastjson import dumps, JSON_LIBRARY
+
+use_database(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend', 'uic_courses.db'))
+
+def course_dicts(courses):
+    """Rebuild the per-course dicts the handlers used to serialize."""
+    return [{
+        'id': c.id,
+        'code': c.code,
+        'title': c.title,
+        'credits': c.credits_undergrad,
+        'creditsUndergrad': c.credits_undergrad,
+        'creditsGrad': c.credits_grad,
+        'level': c.level,
+        'difficulty': c.difficulty,
+        'description': c.description,
+        'prerequisiteGroups': c.prerequisite_groups,
+        'prerequisitesFormatted': c.prerequisites_formatted
+    } for c in courses]
+
+def bench(label, fn, iterations):
+    seconds = timeit.timeit(fn, number=iterations) / iterations
+    size = len(fn())
+    print(f"  {label:<36} {seconds * 1000:8.2f} ms   {size / 1024:8.1f} KiB")
+    return seconds
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    catalog = get_catalog()
+    payload = course_dicts(catalog.courses)
+    print(f"/api/courses payload: {len(payload)} courses, shared encoder uses {JSON_LIBRARY}\n")
+
+    baseline = bench("json.dumps(...).encode()", lambda: json.dumps(payload).encode(), iterations)
+    bench("fastjson.dumps()", lambda: dumps(payload), iterations)
+    try:
+        import orjson
+        bench("orjson.dumps()", lambda: orjson.dumps(payload), iterations)
+    except ImportError:
+        print("  orjson not installed - skipped")
+    join = bench("join prebuilt fragments", lambda: serialize_courses(catalog.courses), iterations)
+
+    # Sanity check: every path must decode to the same data
+    assert json.loads(dumps(payload)) == payload
+    assert json.loads(serialize_courses(catalog.courses)) == payload
+    print(f"\nFragment join is {baseline / join:.0f}x faster than json.dumps on a warm catalog")
@@ -40,6 +40,12 @@ else
     echo -e "${RED}❌ API files missing${NC}"
     exit 1
 fi
+if (cd backend && python3 add_indexes.py --check ../api/uic_courses.db); then
+    echo -e "${GREEN}✅ Query plans use indexes${NC}"
+else
+    echo -e "${RED}❌ Query plan regression (run: cd backend && python3 add_indexes.py, then copy the database to api/)${NC}"
+    exit 1
+fi
 echo ""
 
 # Step 3: Git push
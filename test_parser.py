@@ -6,10 +6,10 @@ Usage: python test_parser.py path/to/audit.pdf
 import sys
 import os
 
-# Add backend to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+# Add api to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
 
-from audit_parser import parse_pdf
+from _audit_parser import parse_pdf
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
@@ -32,7 +32,7 @@ if __name__ == "__main__":
         print("PARSED RESULTS")
         print("="*60)
         
-        completed, in_progress = result
+        completed, in_progress = result['completed'], result['in_progress']
         
         print(f"\nCompleted Courses ({len(completed)}):")
         for course in sorted(completed):